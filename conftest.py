@@ -7,8 +7,12 @@ Signed-off-by: Luis Chamberlain <mcgrof@kernel.org>
 
 import pytest
 import os
+import re
 import json
 from pathlib import Path
+from concurrent.futures import ThreadPoolExecutor
+from botocore.exceptions import ClientError, EndpointConnectionError
+from tests.common.fixtures import TestFixture
 from tests.common.s3_client import S3Client
 
 # Try to import SDK capabilities module
@@ -24,6 +28,39 @@ except ImportError:
     SDK_CAPS_AVAILABLE = False
 
 
+def pytest_configure(config):
+    config.addinivalue_line(
+        "markers",
+        "requires(feature): skip when S3_UNSUPPORTED_FEATURES lists the feature",
+    )
+
+
+def pytest_collection_modifyitems(config, items):
+    """
+    Skip tests that need a feature the backend is known to lack
+
+    S3_UNSUPPORTED_FEATURES is a comma separated list of feature names, for
+    example "service_principal,policy_conditions" for MinIO. Tests marked
+    with @pytest.mark.requires() for a listed feature are skipped at
+    collection, before any requests are sent for them.
+    """
+    unsupported = {
+        feature.strip()
+        for feature in os.getenv("S3_UNSUPPORTED_FEATURES", "").split(",")
+        if feature.strip()
+    }
+    if not unsupported:
+        return
+
+    for item in items:
+        for marker in item.iter_markers(name="requires"):
+            missing = unsupported.intersection(marker.args)
+            if missing:
+                reason = f"Backend lacks {', '.join(sorted(missing))}"
+                item.add_marker(pytest.mark.skip(reason=reason))
+                break
+
+
 @pytest.fixture(scope="session")
 def config():
     """
@@ -40,6 +77,7 @@ def config():
         "verify_ssl": os.getenv("S3_VERIFY_SSL", "false").lower() == "true",
         "s3_sdk": os.getenv("S3_SDK", "boto3"),
         "s3_sdk_version": os.getenv("S3_SDK_VERSION", "latest"),
+        "s3_mock": os.getenv("S3_MOCK", "0") == "1",
     }
 
 
@@ -108,24 +146,177 @@ def sdk_capabilities(config):
         }
 
 
-@pytest.fixture(scope="function")
+@pytest.fixture(scope="session")
+def sdk_profile(sdk_capabilities):
+    """Capability flags of the current SDK, from the capability profile"""
+    return sdk_capabilities.get("profile", {})
+
+
+@pytest.fixture(scope="session")
 def s3_client(config, sdk_capabilities):
     """
     S3 client fixture
 
     Creates an S3Client instance configured for the test environment
-    with SDK capability awareness
+    with SDK capability awareness. The client is shared by the whole
+    session (one per pytest-xdist worker) so tests reuse its service
+    model and its keep-alive connections instead of paying a new
+    connection setup each.
+
+    With S3_MOCK=1 the client talks to moto's in-process S3 backend
+    instead of s3_endpoint. That is meant for quick local iteration on
+    the tests themselves; compatibility results only count against a
+    real S3 implementation.
     """
+    endpoint_url = config["s3_endpoint"]
+    mock = None
+    if config["s3_mock"]:
+        try:
+            from moto import mock_aws
+        except ImportError:
+            pytest.fail("S3_MOCK=1 requires moto: pip install 'moto>=5'")
+
+        # moto only intercepts requests to the default AWS endpoints
+        mock = mock_aws()
+        mock.start()
+        endpoint_url = None
+
     client = S3Client(
-        endpoint_url=config["s3_endpoint"],
+        endpoint_url=endpoint_url,
         access_key=config["s3_access_key"],
         secret_key=config["s3_secret_key"],
         region=config["s3_region"],
-        use_ssl=config["s3_endpoint"].startswith("https"),
+        use_ssl=mock is not None or endpoint_url.startswith("https"),
         verify_ssl=config["verify_ssl"],
         capabilities=sdk_capabilities.get("profile"),
     )
 
+    # Open the first pooled connection before any test runs. Without a
+    # reachable endpoint every test would only fail after its own connect
+    # retries, so skip them all up front instead.
+    try:
+        client.client.list_buckets()
+    except EndpointConnectionError as e:
+        pytest.skip(f"S3 endpoint not reachable: {e}")
+    except Exception as e:
+        print(f"Warning: Failed to warm up S3 connection: {e}")
+
     yield client
 
     # Cleanup happens in test fixtures
+    if mock is not None:
+        mock.stop()
+
+
+@pytest.fixture(scope="session")
+def bucket_policy_supported(s3_client, config):
+    """
+    Bucket policy capability probe
+
+    Puts a minimal policy on a scratch bucket once per session and reports
+    whether the backend supports PutBucketPolicy, so bucket policy suites
+    can skip before creating any buckets of their own
+    """
+    fixture = TestFixture(s3_client, config)
+
+    try:
+        bucket_name = fixture.create_test_bucket(
+            fixture.generate_bucket_name("policy-probe")
+        )
+        policy = {
+            "Version": "2012-10-17",
+            "Statement": [
+                {
+                    "Effect": "Allow",
+                    "Principal": "*",
+                    "Action": "s3:GetObject",
+                    "Resource": f"arn:aws:s3:::{bucket_name}/*",
+                }
+            ],
+        }
+
+        try:
+            s3_client.client.put_bucket_policy(
+                Bucket=bucket_name, Policy=json.dumps(policy)
+            )
+        except ClientError as e:
+            if e.response["Error"]["Code"] in ("NotImplemented", "AccessDenied"):
+                return False
+            # Let the tests themselves report any other failure
+
+        return True
+
+    finally:
+        fixture.cleanup()
+
+
+@pytest.fixture(scope="module")
+def shared_bucket(request, s3_client, config):
+    """
+    Bucket shared by the tests of one module
+
+    For tests that only need some writable bucket. Creating it once per
+    module saves a CreateBucket and DeleteBucket round trip per test. The
+    tests keep apart by using distinct object keys, and the bucket is
+    emptied and removed when the module finishes. The bucket name carries
+    the module name, e.g. msst-test-put-object-additional-1a2b3c4d.
+    """
+    fixture = TestFixture(s3_client, config)
+    module = request.module.__name__.rsplit(".", 1)[-1]
+    suffix = re.sub(r"^test_", "", module).replace("_", "-")
+    bucket_name = fixture.create_test_bucket(fixture.generate_bucket_name(suffix))
+    yield bucket_name
+    fixture.cleanup()
+
+
+@pytest.fixture(scope="module")
+def multipart_upload(s3_client, shared_bucket):
+    """
+    Factory that starts multipart uploads in the module bucket
+
+    Returns the upload ID for a given key. Keyword arguments such as
+    ChecksumAlgorithm are passed on to CreateMultipartUpload. Uploads
+    still open at the end of the module are aborted, so they do not
+    outlive the bucket.
+    """
+    uploads = []
+
+    def create(key, **kwargs):
+        response = s3_client.client.create_multipart_upload(
+            Bucket=shared_bucket, Key=key, **kwargs
+        )
+        uploads.append((key, response["UploadId"]))
+        return response["UploadId"]
+
+    yield create
+
+    def abort(upload):
+        key, upload_id = upload
+        try:
+            s3_client.client.abort_multipart_upload(
+                Bucket=shared_bucket, Key=key, UploadId=upload_id
+            )
+        except ClientError:
+            # Already aborted or completed by the test
+            pass
+
+    # The uploads are independent, so abort them concurrently
+    with ThreadPoolExecutor(max_workers=16) as executor:
+        list(executor.map(abort, uploads))
+
+
+@pytest.fixture
+def policy_bucket(s3_client, shared_bucket):
+    """
+    Shared bucket with no policy attached
+
+    PutBucketPolicy replaces any existing policy, so the tests take turns on
+    one bucket instead of each creating and deleting its own. The policy a
+    test leaves behind is removed before the next one runs.
+    """
+    yield shared_bucket
+    try:
+        s3_client.client.delete_bucket_policy(Bucket=shared_bucket)
+    except ClientError:
+        # Nothing to delete when the test never set a policy
+        pass
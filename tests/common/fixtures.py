@@ -2,10 +2,12 @@
 Test fixtures and utilities for S3 testing
 """
 
+import os
 import uuid
 import random
 import string
 import io
+from concurrent.futures import ThreadPoolExecutor
 from typing import Optional, Dict, Any, List
 from contextlib import contextmanager
 import logging
@@ -31,10 +33,21 @@ class TestFixture:
         self.created_objects = []
 
     def generate_bucket_name(self, suffix: str = None) -> str:
-        """Generate a unique bucket name"""
+        """
+        Generate a unique bucket name
+
+        Uniqueness comes from a random uuid fragment, not from checking
+        existing buckets, so no request is sent to the server. A collision
+        surfaces as BucketAlreadyExists when the bucket is created.
+        """
         name_parts = [self.bucket_prefix]
         if suffix:
             name_parts.append(suffix)
+        # Tag buckets with the pytest-xdist worker (gw0, gw1, ...) so
+        # leftovers from a parallel run can be traced to their worker
+        worker = os.environ.get("PYTEST_XDIST_WORKER")
+        if worker:
+            name_parts.append(worker)
         name_parts.append(str(uuid.uuid4())[:8])
         return "-".join(name_parts).lower()
 
@@ -101,6 +114,32 @@ class TestFixture:
         logger.debug(f"Created test bucket: {bucket_name}")
         return bucket_name
 
+    def create_test_buckets(
+        self, suffixes: List[str], max_workers: int = 8
+    ) -> Dict[str, str]:
+        """
+        Create several test buckets concurrently and track them for cleanup
+
+        Args:
+            suffixes: Bucket name suffixes, one bucket is created per suffix
+            max_workers: Maximum number of concurrent CreateBucket requests
+
+        Returns:
+            Mapping of suffix to bucket name
+        """
+        bucket_names = {
+            suffix: self.generate_bucket_name(suffix) for suffix in suffixes
+        }
+
+        # Track before creating so cleanup also covers a partial failure
+        self.created_buckets.extend(bucket_names.values())
+        with ThreadPoolExecutor(max_workers=max_workers) as executor:
+            # list() re-raises the first CreateBucket failure, if any
+            list(executor.map(self.s3.create_bucket, bucket_names.values()))
+
+        logger.debug(f"Created test buckets: {list(bucket_names.values())}")
+        return bucket_names
+
     def create_test_object(
         self, bucket_name: str, key: str = None, data: bytes = None, size: int = None
     ) -> str:
@@ -129,26 +168,45 @@ class TestFixture:
         logger.debug(f"Created test object: {bucket_name}/{key}")
         return key
 
-    def cleanup(self):
-        """Clean up all created resources"""
-        # Delete all created objects
+    def _delete_test_bucket(self, bucket_name: str):
+        """Empty and delete one tracked bucket, logging any failure"""
+        try:
+            # Empty the bucket first
+            self.s3.empty_bucket(bucket_name)
+            # Delete the bucket
+            self.s3.delete_bucket(bucket_name)
+            logger.debug(f"Deleted test bucket: {bucket_name}")
+        except Exception as e:
+            logger.warning(f"Failed to delete bucket {bucket_name}: {e}")
+
+    def cleanup(self, max_workers: int = 8):
+        """
+        Clean up all created resources
+
+        Args:
+            max_workers: Maximum number of buckets deleted concurrently
+        """
+        # Delete created objects in one batch per bucket, skipping buckets
+        # that are emptied below anyway
+        keys_by_bucket = {}
         for bucket_name, key in self.created_objects:
+            if bucket_name not in self.created_buckets:
+                keys_by_bucket.setdefault(bucket_name, []).append(key)
+        for bucket_name, keys in keys_by_bucket.items():
             try:
-                self.s3.delete_object(bucket_name, key)
-                logger.debug(f"Deleted test object: {bucket_name}/{key}")
+                self.s3.delete_objects(bucket_name, keys)
+                logger.debug(f"Deleted {len(keys)} test objects from {bucket_name}")
             except Exception as e:
-                logger.warning(f"Failed to delete object {bucket_name}/{key}: {e}")
+                logger.warning(f"Failed to delete objects from {bucket_name}: {e}")
 
-        # Empty and delete all created buckets
-        for bucket_name in self.created_buckets:
-            try:
-                # Empty the bucket first
-                self.s3.empty_bucket(bucket_name)
-                # Delete the bucket
-                self.s3.delete_bucket(bucket_name)
-                logger.debug(f"Deleted test bucket: {bucket_name}")
-            except Exception as e:
-                logger.warning(f"Failed to delete bucket {bucket_name}: {e}")
+        # Empty and delete all created buckets, concurrently when there are
+        # several of them
+        if len(self.created_buckets) > 1:
+            with ThreadPoolExecutor(max_workers=max_workers) as executor:
+                list(executor.map(self._delete_test_bucket, self.created_buckets))
+        else:
+            for bucket_name in self.created_buckets:
+                self._delete_test_bucket(bucket_name)
 
         self.created_objects.clear()
         self.created_buckets.clear()
@@ -210,6 +268,49 @@ def calculate_etag(data: bytes) -> str:
     return f'"{hashlib.md5(data).hexdigest()}"'
 
 
+def calculate_checksum(data: bytes, algorithm: str) -> str:
+    """
+    Calculate an S3 additional checksum for data
+
+    CRC32 and the SHA variants come from zlib and hashlib, which run in C
+    (OpenSSL) and use the CPU's CRC and SHA instructions where available.
+    CRC32C needs the optional google-crc32c package, or awscrt as installed
+    by botocore[crt].
+
+    Args:
+        data: Data to checksum
+        algorithm: CRC32, CRC32C, SHA1 or SHA256
+
+    Returns:
+        Base64 encoded checksum, as sent in the x-amz-checksum-* headers
+    """
+    import base64
+    import hashlib
+    import zlib
+
+    algorithm = algorithm.upper()
+    if algorithm == "CRC32":
+        digest = zlib.crc32(data).to_bytes(4, "big")
+    elif algorithm == "CRC32C":
+        try:
+            import google_crc32c
+
+            crc = google_crc32c.value(data)
+        except ImportError:
+            try:
+                from awscrt import checksums
+            except ImportError:
+                raise ImportError("CRC32C checksums require google-crc32c or awscrt")
+            crc = checksums.crc32c(data)
+        digest = crc.to_bytes(4, "big")
+    elif algorithm in ("SHA1", "SHA256"):
+        digest = hashlib.new(algorithm.lower(), data).digest()
+    else:
+        raise ValueError(f"Unsupported checksum algorithm: {algorithm}")
+
+    return base64.b64encode(digest).decode()
+
+
 def compare_data(data1: bytes, data2: bytes) -> bool:
     """
     Compare two data objects
@@ -0,0 +1,37 @@
+"""
+Bucket policy document helpers for S3 testing
+"""
+
+import json
+from string import Template
+from typing import Any, Dict
+
+# Prefer orjson for policy documents when it is installed
+try:
+    import orjson
+
+    def dumps_policy(policy: Dict[str, Any]) -> str:
+        """Serialize a policy document to a JSON string"""
+        return orjson.dumps(policy).decode()
+
+    loads_policy = orjson.loads
+except ImportError:
+    dumps_policy = json.dumps
+    loads_policy = json.loads
+
+
+def policy_template(policy: Dict[str, Any]) -> Template:
+    """
+    Serialize a policy document once, at import time of the test module
+
+    Bucket ARNs use a ${bucket} placeholder, so tests only need
+    Template.substitute(bucket=...) instead of rebuilding and re-encoding
+    the document. Bucket names never need JSON escaping.
+
+    Args:
+        policy: Policy document with ${bucket} placeholders
+
+    Returns:
+        Template of the serialized document
+    """
+    return Template(dumps_policy(policy))
@@ -4,6 +4,7 @@ S3 Client wrapper for test operations
 
 import boto3
 from boto3.s3.transfer import TransferConfig
+from botocore.config import Config
 from botocore.exceptions import ClientError, NoCredentialsError
 from typing import Optional, Dict, Any, List
 import logging
@@ -24,6 +25,11 @@ DEFAULT_CAPABILITIES = {
     "crc32c_default": False,
 }
 
+# Size of the urllib3 connection pool shared by a client. The botocore
+# default of 10 stalls concurrent callers, e.g. pytest-xdist workers or
+# thread pools fanning out requests against the same endpoint.
+MAX_POOL_CONNECTIONS = 32
+
 
 class S3Client:
     """
@@ -56,6 +62,19 @@ class S3Client:
         self.region = region
         self.capabilities = capabilities or DEFAULT_CAPABILITIES.copy()
 
+        # TCP keep-alive stops idle pooled sockets from being dropped by
+        # NATs and load balancers during long runs
+        client_config = Config(
+            max_pool_connections=MAX_POOL_CONNECTIONS,
+            tcp_keepalive=True,
+        )
+        # Only a capability profile that names a retry mode overrides
+        # botocore's own choice, which honours AWS_RETRY_MODE and
+        # ~/.aws/config
+        retry_mode = (capabilities or {}).get("retry_mode")
+        if retry_mode:
+            client_config = client_config.merge(Config(retries={"mode": retry_mode}))
+
         # Create boto3 client
         self.client = boto3.client(
             "s3",
@@ -65,6 +84,7 @@ class S3Client:
             region_name=region,
             use_ssl=use_ssl,
             verify=verify_ssl,
+            config=client_config,
         )
 
         # Create boto3 resource for higher-level operations
@@ -76,6 +96,7 @@ class S3Client:
             region_name=region,
             use_ssl=use_ssl,
             verify=verify_ssl,
+            config=client_config,
         )
 
     def get_capability(self, key: str, default: Any = None) -> Any:
@@ -186,6 +207,34 @@ class S3Client:
             logger.error(f"Error deleting object {bucket_name}/{key}: {e}")
             raise
 
+    def delete_objects(self, bucket_name: str, keys: List[str]) -> int:
+        """
+        Delete objects with one DeleteObjects request per 1000 keys
+
+        Per-key failures are logged rather than raised.
+
+        Returns:
+            Number of objects deleted
+        """
+        count = 0
+        try:
+            for i in range(0, len(keys), 1000):
+                objects = [{"Key": key} for key in keys[i : i + 1000]]
+                response = self.client.delete_objects(
+                    Bucket=bucket_name, Delete={"Objects": objects, "Quiet": True}
+                )
+                errors = response.get("Errors", [])
+                for error in errors:
+                    logger.warning(
+                        f"Failed to delete {bucket_name}/{error['Key']}: "
+                        f"{error['Code']}"
+                    )
+                count += len(objects) - len(errors)
+            return count
+        except ClientError as e:
+            logger.error(f"Error deleting objects from {bucket_name}: {e}")
+            raise
+
     def list_objects(
         self, bucket_name: str, prefix: str = "", max_keys: int = 1000, **kwargs
     ) -> List[Dict[str, Any]]:
@@ -504,13 +553,18 @@ class S3Client:
             raise
 
     def empty_bucket(self, bucket_name: str) -> int:
-        """Delete all objects in a bucket"""
+        """
+        Delete all objects in a bucket
+
+        Objects are removed with one DeleteObjects request per listing page
+        (up to 1000 keys) rather than one DeleteObject request per object.
+        """
         try:
             count = 0
-            bucket = self.resource.Bucket(bucket_name)
-            for obj in bucket.objects.all():
-                obj.delete()
-                count += 1
+            paginator = self.client.get_paginator("list_objects_v2")
+            for page in paginator.paginate(Bucket=bucket_name):
+                keys = [obj["Key"] for obj in page.get("Contents", [])]
+                count += self.delete_objects(bucket_name, keys)
             logger.debug(f"Deleted {count} objects from {bucket_name}")
             return count
         except ClientError as e:
@@ -19,556 +19,344 @@ Signed-off-by: Luis Chamberlain <mcgrof@kernel.org>
 import pytest
 import sys
 import os
-import json
 
 # Add parent directory to path for imports
 sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "../..")))
 
-from tests.common.fixtures import TestFixture
 from botocore.exceptions import ClientError
 
-
-def test_put_bucket_policy_multiple_statements(s3_client, config):
+from tests.common.policy import loads_policy, policy_template
+
+_MULTIPLE_STATEMENTS_POLICY = policy_template(
+    {
+        "Version": "2012-10-17",
+        "Statement": [
+            {
+                "Sid": "AllowGetObject",
+                "Effect": "Allow",
+                "Principal": "*",
+                "Action": "s3:GetObject",
+                "Resource": "arn:aws:s3:::${bucket}/*",
+            },
+            {
+                "Sid": "AllowListBucket",
+                "Effect": "Allow",
+                "Principal": "*",
+                "Action": "s3:ListBucket",
+                "Resource": "arn:aws:s3:::${bucket}",
+            },
+            {
+                "Sid": "DenyDeleteObject",
+                "Effect": "Deny",
+                "Principal": "*",
+                "Action": "s3:DeleteObject",
+                "Resource": "arn:aws:s3:::${bucket}/*",
+            },
+        ],
+    }
+)
+
+
+_RESOURCE_WILDCARD_POLICY = policy_template(
+    {
+        "Version": "2012-10-17",
+        "Statement": [
+            {
+                "Effect": "Allow",
+                "Principal": "*",
+                "Action": ["s3:GetObject", "s3:PutObject"],
+                "Resource": [
+                    "arn:aws:s3:::${bucket}/*",
+                    "arn:aws:s3:::${bucket}/prefix/*",
+                ],
+            }
+        ],
+    }
+)
+
+
+_ACTION_ARRAY_POLICY = policy_template(
+    {
+        "Version": "2012-10-17",
+        "Statement": [
+            {
+                "Effect": "Allow",
+                "Principal": "*",
+                "Action": [
+                    "s3:GetObject",
+                    "s3:GetObjectVersion",
+                    "s3:ListBucket",
+                    "s3:ListBucketVersions",
+                ],
+                "Resource": [
+                    "arn:aws:s3:::${bucket}",
+                    "arn:aws:s3:::${bucket}/*",
+                ],
+            }
+        ],
+    }
+)
+
+
+_SID_POLICY = policy_template(
+    {
+        "Version": "2012-10-17",
+        "Statement": [
+            {
+                "Sid": "PublicReadGetObject",
+                "Effect": "Allow",
+                "Principal": "*",
+                "Action": "s3:GetObject",
+                "Resource": "arn:aws:s3:::${bucket}/*",
+            },
+            {
+                "Sid": "DenyUnencryptedObjectUploads",
+                "Effect": "Deny",
+                "Principal": "*",
+                "Action": "s3:PutObject",
+                "Resource": "arn:aws:s3:::${bucket}/*",
+            },
+        ],
+    }
+)
+
+
+_PRINCIPAL_AWS_ACCOUNT_POLICY = policy_template(
+    {
+        "Version": "2012-10-17",
+        "Statement": [
+            {
+                "Effect": "Allow",
+                "Principal": {"AWS": "arn:aws:iam::123456789012:root"},
+                "Action": "s3:GetObject",
+                "Resource": "arn:aws:s3:::${bucket}/*",
+            }
+        ],
+    }
+)
+
+
+_PRINCIPAL_SERVICE_POLICY = policy_template(
+    {
+        "Version": "2012-10-17",
+        "Statement": [
+            {
+                "Effect": "Allow",
+                "Principal": {"Service": "logging.s3.amazonaws.com"},
+                "Action": "s3:PutObject",
+                "Resource": "arn:aws:s3:::${bucket}/*",
+            }
+        ],
+    }
+)
+
+
+_S3_ALL_ACTIONS_POLICY = policy_template(
+    {
+        "Version": "2012-10-17",
+        "Statement": [
+            {
+                "Effect": "Allow",
+                "Principal": "*",
+                "Action": "s3:*",
+                "Resource": [
+                    "arn:aws:s3:::${bucket}",
+                    "arn:aws:s3:::${bucket}/*",
+                ],
+            }
+        ],
+    }
+)
+
+
+_INVALID_PRINCIPAL_POLICY = policy_template(
+    {
+        "Version": "2012-10-17",
+        "Statement": [
+            {
+                "Effect": "Allow",
+                "Principal": "InvalidFormat",  # Should be "*" or object
+                "Action": "s3:GetObject",
+                "Resource": "arn:aws:s3:::${bucket}/*",
+            }
+        ],
+    }
+)
+
+
+_INVALID_ACTION_POLICY = policy_template(
+    {
+        "Version": "2012-10-17",
+        "Statement": [
+            {
+                "Effect": "Allow",
+                "Principal": "*",
+                "Action": "s3:InvalidAction",
+                "Resource": "arn:aws:s3:::${bucket}/*",
+            }
+        ],
+    }
+)
+
+
+_ALLOW_GET_POLICY = policy_template(
+    {
+        "Version": "2012-10-17",
+        "Statement": [
+            {
+                "Effect": "Allow",
+                "Principal": "*",
+                "Action": "s3:GetObject",
+                "Resource": "arn:aws:s3:::${bucket}/*",
+            }
+        ],
+    }
+)
+
+
+_DENY_DELETE_POLICY = policy_template(
+    {
+        "Version": "2012-10-17",
+        "Statement": [
+            {
+                "Effect": "Deny",
+                "Principal": "*",
+                "Action": "s3:DeleteObject",
+                "Resource": "arn:aws:s3:::${bucket}/*",
+            }
+        ],
+    }
+)
+
+
+# Valid policies. unsupported lists (error code, message fragment) pairs
+# that mean the backend lacks the feature under test rather than rejecting
+# a valid policy.
+POLICY_CASES = [
+    pytest.param(_MULTIPLE_STATEMENTS_POLICY, (), id="multi-stmt"),
+    pytest.param(_RESOURCE_WILDCARD_POLICY, (), id="wildcard"),
+    pytest.param(_ACTION_ARRAY_POLICY, (), id="action-array"),
+    pytest.param(_SID_POLICY, (), id="sid"),
+    pytest.param(_PRINCIPAL_AWS_ACCOUNT_POLICY, (), id="principal-aws"),
+    # MinIO doesn't support Service principals
+    pytest.param(
+        _PRINCIPAL_SERVICE_POLICY,
+        (("MalformedPolicy", "invalid Principal"),),
+        id="principal-service",
+        marks=pytest.mark.requires("service_principal"),
+    ),
+    pytest.param(_S3_ALL_ACTIONS_POLICY, (), id="s3-all"),
+]
+
+# Error codes accepted for a policy the backend refuses to parse
+_MALFORMED_ERRS = frozenset({"MalformedPolicy", "InvalidArgument"})
+
+# Invalid policies with the error codes accepted for them
+INVALID_POLICY_CASES = [
+    pytest.param(
+        _INVALID_PRINCIPAL_POLICY,
+        _MALFORMED_ERRS | {"InvalidPrincipal"},
+        id="invalid-principal",
+    ),
+    pytest.param(
+        _INVALID_ACTION_POLICY,
+        _MALFORMED_ERRS | {"InvalidAction"},
+        id="invalid-action",
+    ),
+]
+
+
+@pytest.fixture(scope="module", autouse=True)
+def _require_bucket_policy(bucket_policy_supported):
+    """Skip the whole module on backends without bucket policy support"""
+    if not bucket_policy_supported:
+        pytest.skip("PutBucketPolicy not supported")
+
+
+@pytest.mark.parametrize("template,unsupported", POLICY_CASES)
+def test_put_bucket_policy_valid(s3_client, policy_bucket, template, unsupported):
     """
-    Test PutBucketPolicy with multiple statements
+    Test PutBucketPolicy with valid policy structures
 
-    Should accept policy with multiple Allow/Deny statements
+    Covers multiple statements, Resource wildcards, Action arrays, Sid,
+    AWS account and Service principals and the s3:* action. Should accept
+    the policy and return it from GetBucketPolicy.
     """
-    fixture = TestFixture(s3_client, config)
-
+    # Put bucket policy
     try:
-        bucket_name = fixture.generate_bucket_name("policy-multi-stmt")
-        s3_client.create_bucket(bucket_name)
-
-        # Create policy with multiple statements
-        policy = {
-            "Version": "2012-10-17",
-            "Statement": [
-                {
-                    "Sid": "AllowGetObject",
-                    "Effect": "Allow",
-                    "Principal": "*",
-                    "Action": "s3:GetObject",
-                    "Resource": f"arn:aws:s3:::{bucket_name}/*",
-                },
-                {
-                    "Sid": "AllowListBucket",
-                    "Effect": "Allow",
-                    "Principal": "*",
-                    "Action": "s3:ListBucket",
-                    "Resource": f"arn:aws:s3:::{bucket_name}",
-                },
-                {
-                    "Sid": "DenyDeleteObject",
-                    "Effect": "Deny",
-                    "Principal": "*",
-                    "Action": "s3:DeleteObject",
-                    "Resource": f"arn:aws:s3:::{bucket_name}/*",
-                },
-            ],
-        }
-
-        # Put bucket policy
-        try:
-            s3_client.client.put_bucket_policy(
-                Bucket=bucket_name, Policy=json.dumps(policy)
-            )
-        except ClientError as e:
-            if e.response["Error"]["Code"] in ["NotImplemented", "AccessDenied"]:
-                pytest.skip("PutBucketPolicy not supported")
-                return
-            raise
-
-        # Verify with GetBucketPolicy
-        try:
-            policy_response = s3_client.client.get_bucket_policy(Bucket=bucket_name)
-            assert "Policy" in policy_response
-
-            returned_policy = json.loads(policy_response["Policy"])
-            assert "Statement" in returned_policy
-            # Should have multiple statements
-            assert len(returned_policy["Statement"]) >= 1
-
-        except ClientError as e:
-            if e.response["Error"]["Code"] == "NotImplemented":
-                pytest.skip("GetBucketPolicy not supported")
-
-    finally:
-        fixture.cleanup()
-
-
-def test_put_bucket_policy_resource_wildcard(s3_client, config):
-    """
-    Test PutBucketPolicy with wildcard in Resource
-
-    Should accept policy with Resource patterns like bucket/*
-    """
-    fixture = TestFixture(s3_client, config)
-
+        s3_client.client.put_bucket_policy(
+            Bucket=policy_bucket, Policy=template.substitute(bucket=policy_bucket)
+        )
+    except ClientError as e:
+        error_code = e.response["Error"]["Code"]
+        for code, fragment in unsupported:
+            if error_code == code and fragment in str(e):
+                pytest.skip(f"Policy not supported: {error_code}")
+        raise
+
+    # Verify with GetBucketPolicy
     try:
-        bucket_name = fixture.generate_bucket_name("policy-wildcard")
-        s3_client.create_bucket(bucket_name)
-
-        # Create policy with wildcard resource
-        policy = {
-            "Version": "2012-10-17",
-            "Statement": [
-                {
-                    "Effect": "Allow",
-                    "Principal": "*",
-                    "Action": ["s3:GetObject", "s3:PutObject"],
-                    "Resource": [
-                        f"arn:aws:s3:::{bucket_name}/*",
-                        f"arn:aws:s3:::{bucket_name}/prefix/*",
-                    ],
-                }
-            ],
-        }
-
-        # Put bucket policy
-        try:
-            s3_client.client.put_bucket_policy(
-                Bucket=bucket_name, Policy=json.dumps(policy)
-            )
-        except ClientError as e:
-            if e.response["Error"]["Code"] in ["NotImplemented", "AccessDenied"]:
-                pytest.skip("PutBucketPolicy not supported")
-                return
-            raise
-
-        # Verify policy was set
-        try:
-            policy_response = s3_client.client.get_bucket_policy(Bucket=bucket_name)
-            assert "Policy" in policy_response
-        except ClientError as e:
-            if e.response["Error"]["Code"] == "NotImplemented":
-                pytest.skip("GetBucketPolicy not supported")
-
-    finally:
-        fixture.cleanup()
-
-
-def test_put_bucket_policy_action_array(s3_client, config):
-    """
-    Test PutBucketPolicy with Action as array
+        policy_response = s3_client.client.get_bucket_policy(Bucket=policy_bucket)
+        assert "Policy" in policy_response
 
-    Should accept multiple actions in array format
-    """
-    fixture = TestFixture(s3_client, config)
+        returned_policy = loads_policy(policy_response["Policy"])
+        # Implementations may transform the policy, so only check
+        # that statements come back
+        assert "Statement" in returned_policy
+        assert len(returned_policy["Statement"]) >= 1
 
-    try:
-        bucket_name = fixture.generate_bucket_name("policy-action-array")
-        s3_client.create_bucket(bucket_name)
-
-        # Create policy with multiple actions
-        policy = {
-            "Version": "2012-10-17",
-            "Statement": [
-                {
-                    "Effect": "Allow",
-                    "Principal": "*",
-                    "Action": [
-                        "s3:GetObject",
-                        "s3:GetObjectVersion",
-                        "s3:ListBucket",
-                        "s3:ListBucketVersions",
-                    ],
-                    "Resource": [
-                        f"arn:aws:s3:::{bucket_name}",
-                        f"arn:aws:s3:::{bucket_name}/*",
-                    ],
-                }
-            ],
-        }
-
-        # Put bucket policy
-        try:
-            s3_client.client.put_bucket_policy(
-                Bucket=bucket_name, Policy=json.dumps(policy)
-            )
-        except ClientError as e:
-            if e.response["Error"]["Code"] in ["NotImplemented", "AccessDenied"]:
-                pytest.skip("PutBucketPolicy not supported")
-                return
-            raise
-
-        # Verify policy was set
-        try:
-            policy_response = s3_client.client.get_bucket_policy(Bucket=bucket_name)
-            assert "Policy" in policy_response
-        except ClientError as e:
-            if e.response["Error"]["Code"] == "NotImplemented":
-                pytest.skip("GetBucketPolicy not supported")
-
-    finally:
-        fixture.cleanup()
-
-
-def test_put_bucket_policy_with_sid(s3_client, config):
-    """
-    Test PutBucketPolicy with Sid (Statement ID)
+    except ClientError as e:
+        if e.response["Error"]["Code"] == "NotImplemented":
+            pytest.skip("GetBucketPolicy not supported")
 
-    Sid is optional but useful for identifying statements
-    """
-    fixture = TestFixture(s3_client, config)
 
-    try:
-        bucket_name = fixture.generate_bucket_name("policy-sid")
-        s3_client.create_bucket(bucket_name)
-
-        # Create policy with Sid
-        policy = {
-            "Version": "2012-10-17",
-            "Statement": [
-                {
-                    "Sid": "PublicReadGetObject",
-                    "Effect": "Allow",
-                    "Principal": "*",
-                    "Action": "s3:GetObject",
-                    "Resource": f"arn:aws:s3:::{bucket_name}/*",
-                },
-                {
-                    "Sid": "DenyUnencryptedObjectUploads",
-                    "Effect": "Deny",
-                    "Principal": "*",
-                    "Action": "s3:PutObject",
-                    "Resource": f"arn:aws:s3:::{bucket_name}/*",
-                },
-            ],
-        }
-
-        # Put bucket policy
-        try:
-            s3_client.client.put_bucket_policy(
-                Bucket=bucket_name, Policy=json.dumps(policy)
-            )
-        except ClientError as e:
-            if e.response["Error"]["Code"] in ["NotImplemented", "AccessDenied"]:
-                pytest.skip("PutBucketPolicy not supported")
-                return
-            raise
-
-        # Verify policy was set
-        try:
-            policy_response = s3_client.client.get_bucket_policy(Bucket=bucket_name)
-            assert "Policy" in policy_response
-
-            returned_policy = json.loads(policy_response["Policy"])
-            # Check if Sids are preserved (implementation may vary)
-            assert "Statement" in returned_policy
-
-        except ClientError as e:
-            if e.response["Error"]["Code"] == "NotImplemented":
-                pytest.skip("GetBucketPolicy not supported")
-
-    finally:
-        fixture.cleanup()
-
-
-def test_put_bucket_policy_update_existing(s3_client, config):
+def test_put_bucket_policy_update_existing(s3_client, policy_bucket):
     """
     Test updating existing bucket policy
 
     PutBucketPolicy replaces entire policy
     """
-    fixture = TestFixture(s3_client, config)
-
+    # Create initial policy
+    s3_client.client.put_bucket_policy(
+        Bucket=policy_bucket,
+        Policy=_ALLOW_GET_POLICY.substitute(bucket=policy_bucket),
+    )
+
+    # Update with new policy (replaces old one)
+    s3_client.client.put_bucket_policy(
+        Bucket=policy_bucket,
+        Policy=_DENY_DELETE_POLICY.substitute(bucket=policy_bucket),
+    )
+
+    # Verify updated policy
     try:
-        bucket_name = fixture.generate_bucket_name("policy-update")
-        s3_client.create_bucket(bucket_name)
-
-        # Create initial policy
-        policy1 = {
-            "Version": "2012-10-17",
-            "Statement": [
-                {
-                    "Effect": "Allow",
-                    "Principal": "*",
-                    "Action": "s3:GetObject",
-                    "Resource": f"arn:aws:s3:::{bucket_name}/*",
-                }
-            ],
-        }
-
-        try:
-            s3_client.client.put_bucket_policy(
-                Bucket=bucket_name, Policy=json.dumps(policy1)
-            )
-        except ClientError as e:
-            if e.response["Error"]["Code"] in ["NotImplemented", "AccessDenied"]:
-                pytest.skip("PutBucketPolicy not supported")
-                return
-            raise
-
-        # Update with new policy (replaces old one)
-        policy2 = {
-            "Version": "2012-10-17",
-            "Statement": [
-                {
-                    "Effect": "Deny",
-                    "Principal": "*",
-                    "Action": "s3:DeleteObject",
-                    "Resource": f"arn:aws:s3:::{bucket_name}/*",
-                }
-            ],
-        }
+        policy_response = s3_client.client.get_bucket_policy(Bucket=policy_bucket)
+        assert "Policy" in policy_response
 
-        s3_client.client.put_bucket_policy(
-            Bucket=bucket_name, Policy=json.dumps(policy2)
-        )
+        returned_policy = loads_policy(policy_response["Policy"])
+        # Should have new policy (implementation may preserve or transform)
+        assert "Statement" in returned_policy
 
-        # Verify updated policy
-        try:
-            policy_response = s3_client.client.get_bucket_policy(Bucket=bucket_name)
-            assert "Policy" in policy_response
+    except ClientError as e:
+        if e.response["Error"]["Code"] == "NotImplemented":
+            pytest.skip("GetBucketPolicy not supported")
 
-            returned_policy = json.loads(policy_response["Policy"])
-            # Should have new policy (implementation may preserve or transform)
-            assert "Statement" in returned_policy
 
-        except ClientError as e:
-            if e.response["Error"]["Code"] == "NotImplemented":
-                pytest.skip("GetBucketPolicy not supported")
-
-    finally:
-        fixture.cleanup()
-
-
-def test_put_bucket_policy_principal_aws_account(s3_client, config):
+@pytest.mark.parametrize("template,expected_errors", INVALID_POLICY_CASES)
+def test_put_bucket_policy_invalid(s3_client, policy_bucket, template, expected_errors):
     """
-    Test PutBucketPolicy with AWS account principal
+    Test PutBucketPolicy with an invalid Principal or Action
 
-    Principal can be AWS account ID
+    Should return MalformedPolicy, though some implementations accept these
+    policies without validation
     """
-    fixture = TestFixture(s3_client, config)
-
     try:
-        bucket_name = fixture.generate_bucket_name("policy-principal-aws")
-        s3_client.create_bucket(bucket_name)
-
-        # Create policy with AWS account principal
-        policy = {
-            "Version": "2012-10-17",
-            "Statement": [
-                {
-                    "Effect": "Allow",
-                    "Principal": {"AWS": "arn:aws:iam::123456789012:root"},
-                    "Action": "s3:GetObject",
-                    "Resource": f"arn:aws:s3:::{bucket_name}/*",
-                }
-            ],
-        }
-
-        # Put bucket policy
-        try:
-            s3_client.client.put_bucket_policy(
-                Bucket=bucket_name, Policy=json.dumps(policy)
-            )
-        except ClientError as e:
-            if e.response["Error"]["Code"] in ["NotImplemented", "AccessDenied"]:
-                pytest.skip("PutBucketPolicy not supported")
-                return
-            raise
-
-        # Verify policy was set
-        try:
-            policy_response = s3_client.client.get_bucket_policy(Bucket=bucket_name)
-            assert "Policy" in policy_response
-        except ClientError as e:
-            if e.response["Error"]["Code"] == "NotImplemented":
-                pytest.skip("GetBucketPolicy not supported")
-
-    finally:
-        fixture.cleanup()
-
-
-def test_put_bucket_policy_principal_service(s3_client, config):
-    """
-    Test PutBucketPolicy with Service principal
-
-    Principal can be AWS service
-    """
-    fixture = TestFixture(s3_client, config)
-
-    try:
-        bucket_name = fixture.generate_bucket_name("policy-principal-service")
-        s3_client.create_bucket(bucket_name)
-
-        # Create policy with Service principal
-        policy = {
-            "Version": "2012-10-17",
-            "Statement": [
-                {
-                    "Effect": "Allow",
-                    "Principal": {"Service": "logging.s3.amazonaws.com"},
-                    "Action": "s3:PutObject",
-                    "Resource": f"arn:aws:s3:::{bucket_name}/*",
-                }
-            ],
-        }
-
-        # Put bucket policy
-        try:
-            s3_client.client.put_bucket_policy(
-                Bucket=bucket_name, Policy=json.dumps(policy)
-            )
-        except ClientError as e:
-            error_code = e.response["Error"]["Code"]
-            # MinIO doesn't support Service principals
-            if error_code == "MalformedPolicy" and "invalid Principal" in str(e):
-                pytest.skip("Service principal not supported (MinIO limitation)")
-                return
-            if error_code in ["NotImplemented", "AccessDenied"]:
-                pytest.skip("PutBucketPolicy not supported")
-                return
-            raise
-
-        # Verify policy was set
-        try:
-            policy_response = s3_client.client.get_bucket_policy(Bucket=bucket_name)
-            assert "Policy" in policy_response
-        except ClientError as e:
-            if e.response["Error"]["Code"] == "NotImplemented":
-                pytest.skip("GetBucketPolicy not supported")
-
-    finally:
-        fixture.cleanup()
-
-
-def test_put_bucket_policy_s3_all_actions(s3_client, config):
-    """
-    Test PutBucketPolicy with s3:* wildcard action
-
-    Should accept wildcard for all S3 actions
-    """
-    fixture = TestFixture(s3_client, config)
-
-    try:
-        bucket_name = fixture.generate_bucket_name("policy-s3-all")
-        s3_client.create_bucket(bucket_name)
-
-        # Create policy with s3:* action
-        policy = {
-            "Version": "2012-10-17",
-            "Statement": [
-                {
-                    "Effect": "Allow",
-                    "Principal": "*",
-                    "Action": "s3:*",
-                    "Resource": [
-                        f"arn:aws:s3:::{bucket_name}",
-                        f"arn:aws:s3:::{bucket_name}/*",
-                    ],
-                }
-            ],
-        }
-
-        # Put bucket policy
-        try:
-            s3_client.client.put_bucket_policy(
-                Bucket=bucket_name, Policy=json.dumps(policy)
-            )
-        except ClientError as e:
-            if e.response["Error"]["Code"] in ["NotImplemented", "AccessDenied"]:
-                pytest.skip("PutBucketPolicy not supported")
-                return
-            raise
-
-        # Verify policy was set
-        try:
-            policy_response = s3_client.client.get_bucket_policy(Bucket=bucket_name)
-            assert "Policy" in policy_response
-        except ClientError as e:
-            if e.response["Error"]["Code"] == "NotImplemented":
-                pytest.skip("GetBucketPolicy not supported")
-
-    finally:
-        fixture.cleanup()
-
-
-def test_put_bucket_policy_invalid_principal(s3_client, config):
-    """
-    Test PutBucketPolicy with invalid Principal format
-
-    Should return error for malformed Principal
-    """
-    fixture = TestFixture(s3_client, config)
-
-    try:
-        bucket_name = fixture.generate_bucket_name("policy-invalid-principal")
-        s3_client.create_bucket(bucket_name)
-
-        # Create policy with invalid Principal (string instead of object)
-        policy = {
-            "Version": "2012-10-17",
-            "Statement": [
-                {
-                    "Effect": "Allow",
-                    "Principal": "InvalidFormat",  # Should be "*" or object
-                    "Action": "s3:GetObject",
-                    "Resource": f"arn:aws:s3:::{bucket_name}/*",
-                }
-            ],
-        }
-
-        # Try PutBucketPolicy with invalid Principal
-        try:
-            s3_client.client.put_bucket_policy(
-                Bucket=bucket_name, Policy=json.dumps(policy)
-            )
-            # Some implementations may accept this
-        except ClientError as e:
-            error_code = e.response["Error"]["Code"]
-            # Should return error for invalid Principal
-            assert error_code in [
-                "MalformedPolicy",
-                "InvalidArgument",
-                "InvalidPrincipal",
-            ], f"Expected MalformedPolicy, got {error_code}"
-
-    finally:
-        fixture.cleanup()
-
-
-def test_put_bucket_policy_invalid_action(s3_client, config):
-    """
-    Test PutBucketPolicy with invalid Action
-
-    Should return error for invalid action names
-    """
-    fixture = TestFixture(s3_client, config)
-
-    try:
-        bucket_name = fixture.generate_bucket_name("policy-invalid-action")
-        s3_client.create_bucket(bucket_name)
-
-        # Create policy with invalid Action
-        policy = {
-            "Version": "2012-10-17",
-            "Statement": [
-                {
-                    "Effect": "Allow",
-                    "Principal": "*",
-                    "Action": "s3:InvalidAction",
-                    "Resource": f"arn:aws:s3:::{bucket_name}/*",
-                }
-            ],
-        }
-
-        # Try PutBucketPolicy with invalid Action
-        try:
-            s3_client.client.put_bucket_policy(
-                Bucket=bucket_name, Policy=json.dumps(policy)
-            )
-            # Some implementations may accept this without validation
-        except ClientError as e:
-            error_code = e.response["Error"]["Code"]
-            # May return error for invalid Action
-            assert error_code in [
-                "MalformedPolicy",
-                "InvalidArgument",
-                "InvalidAction",
-            ], f"Expected MalformedPolicy, got {error_code}"
-
-    finally:
-        fixture.cleanup()
+        s3_client.client.put_bucket_policy(
+            Bucket=policy_bucket, Policy=template.substitute(bucket=policy_bucket)
+        )
+        # Some implementations may accept this
+    except ClientError as e:
+        error_code = e.response["Error"]["Code"]
+        assert (
+            error_code in expected_errors
+        ), f"Expected MalformedPolicy, got {error_code}"
@@ -16,403 +16,320 @@ Signed-off-by: Luis Chamberlain <mcgrof@kernel.org>
 """
 
 import pytest
-import sys
 import os
+from concurrent.futures import ThreadPoolExecutor
 
-# Add parent directory to path for imports
-sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '../..')))
-
-from tests.common.fixtures import TestFixture
 from botocore.exceptions import ClientError
 
+# The server never inspects payload bytes, so tests slice one random buffer
+_RANDOM_DATA = os.urandom(256)
+
 
-def test_put_object_non_existing_bucket(s3_client, config):
+def test_put_object_non_existing_bucket(s3_client):
     """
     Test PutObject to non-existing bucket
 
     Should return NoSuchBucket error
     """
-    fixture = TestFixture(s3_client, config)
-
-    try:
-        # Try to put object to non-existing bucket
-        with pytest.raises(ClientError) as exc_info:
-            s3_client.put_object('non-existing-bucket-12345', 'test-object', b'data')
-
-        error_code = exc_info.value.response['Error']['Code']
-        assert error_code == 'NoSuchBucket', \
-            f"Expected NoSuchBucket, got {error_code}"
+    # Try to put object to non-existing bucket
+    with pytest.raises(ClientError) as exc_info:
+        s3_client.put_object('non-existing-bucket-12345', 'test-object', b'data')
 
-    finally:
-        fixture.cleanup()
+    error_code = exc_info.value.response['Error']['Code']
+    assert error_code == 'NoSuchBucket', \
+        f"Expected NoSuchBucket, got {error_code}"
 
 
-def test_put_object_zero_length(s3_client, config):
+def test_put_object_zero_length(s3_client, shared_bucket):
     """
     Test PutObject with zero-length content
 
     Zero-length objects should be created successfully
     """
-    fixture = TestFixture(s3_client, config)
-
-    try:
-        bucket_name = fixture.generate_bucket_name('put-zero-len')
-        s3_client.create_bucket(bucket_name)
-
-        key = 'empty-object'
-        put_response = s3_client.put_object(bucket_name, key, b'')
-
-        # Verify object exists
-        head_response = s3_client.head_object(bucket_name, key)
-        assert head_response['ContentLength'] == 0
+    bucket_name = shared_bucket
 
-        # Verify can retrieve empty object
-        get_response = s3_client.get_object(bucket_name, key)
-        data = get_response['Body'].read()
-        assert len(data) == 0
+    key = 'empty-object'
+    s3_client.put_object(bucket_name, key, b'')
 
-    finally:
-        fixture.cleanup()
+    # Verify can retrieve empty object, with its length in the response
+    get_response = s3_client.get_object(bucket_name, key)
+    assert get_response['ContentLength'] == 0
+    data = get_response['Body'].read()
+    assert len(data) == 0
 
 
-def test_put_object_with_metadata(s3_client, config):
+def test_put_object_with_metadata(s3_client, shared_bucket):
     """
     Test PutObject with custom metadata
 
     Metadata should be stored and retrievable
     """
-    fixture = TestFixture(s3_client, config)
+    bucket_name = shared_bucket
 
-    try:
-        bucket_name = fixture.generate_bucket_name('put-metadata')
-        s3_client.create_bucket(bucket_name)
+    key = 'object-with-metadata'
+    data = _RANDOM_DATA[:256]
+    metadata = {
+        'author': 'test-user',
+        'version': '1.0',
+        'environment': 'testing'
+    }
 
-        key = 'object-with-metadata'
-        data = fixture.generate_random_data(256)
-        metadata = {
-            'author': 'test-user',
-            'version': '1.0',
-            'environment': 'testing'
-        }
+    s3_client.client.put_object(
+        Bucket=bucket_name,
+        Key=key,
+        Body=data,
+        Metadata=metadata
+    )
 
-        s3_client.client.put_object(
-            Bucket=bucket_name,
-            Key=key,
-            Body=data,
-            Metadata=metadata
-        )
+    # Verify metadata is stored
+    head_response = s3_client.head_object(bucket_name, key)
+    retrieved_metadata = head_response.get('Metadata', {})
 
-        # Verify metadata is stored
-        head_response = s3_client.head_object(bucket_name, key)
-        retrieved_metadata = head_response.get('Metadata', {})
+    assert retrieved_metadata == metadata, \
+        f"Expected metadata {metadata}, got {retrieved_metadata}"
 
-        assert retrieved_metadata == metadata, \
-            f"Expected metadata {metadata}, got {retrieved_metadata}"
 
-    finally:
-        fixture.cleanup()
-
-
-def test_put_object_with_content_type(s3_client, config):
+def test_put_object_with_content_type(s3_client, shared_bucket):
     """
     Test PutObject with explicit ContentType
 
     ContentType should be preserved
     """
-    fixture = TestFixture(s3_client, config)
-
-    try:
-        bucket_name = fixture.generate_bucket_name('put-content-type')
-        s3_client.create_bucket(bucket_name)
-
-        test_cases = [
-            ('text.txt', 'text/plain'),
-            ('data.json', 'application/json'),
-            ('image.png', 'image/png'),
-            ('doc.pdf', 'application/pdf'),
-            ('video.mp4', 'video/mp4'),
-        ]
-
-        for key, content_type in test_cases:
-            data = fixture.generate_random_data(100)
-
-            s3_client.client.put_object(
-                Bucket=bucket_name,
-                Key=key,
-                Body=data,
-                ContentType=content_type
-            )
+    bucket_name = shared_bucket
+
+    test_cases = [
+        ('text.txt', 'text/plain'),
+        ('data.json', 'application/json'),
+        ('image.png', 'image/png'),
+        ('doc.pdf', 'application/pdf'),
+        ('video.mp4', 'video/mp4'),
+    ]
+
+    def put_and_head(case):
+        key, content_type = case
+        s3_client.client.put_object(
+            Bucket=bucket_name,
+            Key=key,
+            Body=_RANDOM_DATA[:100],
+            ContentType=content_type
+        )
+        return s3_client.head_object(bucket_name, key)['ContentType']
 
-            head_response = s3_client.head_object(bucket_name, key)
-            assert head_response['ContentType'] == content_type, \
-                f"Key {key}: Expected ContentType {content_type}, got {head_response['ContentType']}"
+    # The keys are independent, so upload and check them concurrently
+    with ThreadPoolExecutor(max_workers=len(test_cases)) as executor:
+        stored_types = list(executor.map(put_and_head, test_cases))
 
-    finally:
-        fixture.cleanup()
+    for (key, content_type), stored_type in zip(test_cases, stored_types):
+        assert stored_type == content_type, \
+            f"Key {key}: Expected ContentType {content_type}, got {stored_type}"
 
 
-def test_put_object_with_cache_control(s3_client, config):
+def test_put_object_with_cache_control(s3_client, shared_bucket):
     """
     Test PutObject with Cache-Control header
 
     Cache-Control should be stored and retrievable
     """
-    fixture = TestFixture(s3_client, config)
-
-    try:
-        bucket_name = fixture.generate_bucket_name('put-cache')
-        s3_client.create_bucket(bucket_name)
+    bucket_name = shared_bucket
 
-        key = 'cached-object'
-        data = fixture.generate_random_data(100)
-        cache_control = 'max-age=3600, public'
+    key = 'cached-object'
+    data = _RANDOM_DATA[:100]
+    cache_control = 'max-age=3600, public'
 
-        s3_client.client.put_object(
-            Bucket=bucket_name,
-            Key=key,
-            Body=data,
-            CacheControl=cache_control
-        )
-
-        head_response = s3_client.head_object(bucket_name, key)
-        assert head_response.get('CacheControl') == cache_control, \
-            f"Expected CacheControl {cache_control}, got {head_response.get('CacheControl')}"
+    s3_client.client.put_object(
+        Bucket=bucket_name,
+        Key=key,
+        Body=data,
+        CacheControl=cache_control
+    )
 
-    finally:
-        fixture.cleanup()
+    head_response = s3_client.head_object(bucket_name, key)
+    assert head_response.get('CacheControl') == cache_control, \
+        f"Expected CacheControl {cache_control}, got {head_response.get('CacheControl')}"
 
 
-def test_put_object_with_content_encoding(s3_client, config):
+def test_put_object_with_content_encoding(s3_client, shared_bucket):
     """
     Test PutObject with ContentEncoding
 
     ContentEncoding should be preserved
     """
-    fixture = TestFixture(s3_client, config)
+    bucket_name = shared_bucket
 
-    try:
-        bucket_name = fixture.generate_bucket_name('put-encoding')
-        s3_client.create_bucket(bucket_name)
-
-        key = 'encoded-object'
-        data = fixture.generate_random_data(200)
-        content_encoding = 'gzip'
-
-        s3_client.client.put_object(
-            Bucket=bucket_name,
-            Key=key,
-            Body=data,
-            ContentEncoding=content_encoding
-        )
+    key = 'encoded-object'
+    data = _RANDOM_DATA[:200]
+    content_encoding = 'gzip'
 
-        head_response = s3_client.head_object(bucket_name, key)
-        assert head_response.get('ContentEncoding') == content_encoding
+    s3_client.client.put_object(
+        Bucket=bucket_name,
+        Key=key,
+        Body=data,
+        ContentEncoding=content_encoding
+    )
 
-    finally:
-        fixture.cleanup()
+    head_response = s3_client.head_object(bucket_name, key)
+    assert head_response.get('ContentEncoding') == content_encoding
 
 
-def test_put_object_with_content_disposition(s3_client, config):
+def test_put_object_with_content_disposition(s3_client, shared_bucket):
     """
     Test PutObject with ContentDisposition
 
     ContentDisposition should be preserved
     """
-    fixture = TestFixture(s3_client, config)
-
-    try:
-        bucket_name = fixture.generate_bucket_name('put-disposition')
-        s3_client.create_bucket(bucket_name)
+    bucket_name = shared_bucket
 
-        key = 'download-object'
-        data = fixture.generate_random_data(150)
-        content_disposition = 'attachment; filename="download.bin"'
-
-        s3_client.client.put_object(
-            Bucket=bucket_name,
-            Key=key,
-            Body=data,
-            ContentDisposition=content_disposition
-        )
+    key = 'download-object'
+    data = _RANDOM_DATA[:150]
+    content_disposition = 'attachment; filename="download.bin"'
 
-        head_response = s3_client.head_object(bucket_name, key)
-        assert head_response.get('ContentDisposition') == content_disposition
+    s3_client.client.put_object(
+        Bucket=bucket_name,
+        Key=key,
+        Body=data,
+        ContentDisposition=content_disposition
+    )
 
-    finally:
-        fixture.cleanup()
+    head_response = s3_client.head_object(bucket_name, key)
+    assert head_response.get('ContentDisposition') == content_disposition
 
 
-def test_put_object_with_storage_class(s3_client, config):
+def test_put_object_with_storage_class(s3_client, shared_bucket):
     """
     Test PutObject with StorageClass
 
     StorageClass should be set (if supported)
     """
-    fixture = TestFixture(s3_client, config)
+    bucket_name = shared_bucket
 
-    try:
-        bucket_name = fixture.generate_bucket_name('put-storage')
-        s3_client.create_bucket(bucket_name)
+    key = 'standard-object'
+    data = _RANDOM_DATA[:100]
+    storage_class = 'STANDARD'
 
-        key = 'standard-object'
-        data = fixture.generate_random_data(100)
-        storage_class = 'STANDARD'
+    s3_client.client.put_object(
+        Bucket=bucket_name,
+        Key=key,
+        Body=data,
+        StorageClass=storage_class
+    )
 
-        s3_client.client.put_object(
-            Bucket=bucket_name,
-            Key=key,
-            Body=data,
-            StorageClass=storage_class
-        )
-
-        head_response = s3_client.head_object(bucket_name, key)
-        # StorageClass may not always be returned in HeadObject
-        # Just verify object was created successfully
-        assert head_response['ContentLength'] == 100
+    head_response = s3_client.head_object(bucket_name, key)
+    # StorageClass may not always be returned in HeadObject
+    # Just verify object was created successfully
+    assert head_response['ContentLength'] == 100
 
-    finally:
-        fixture.cleanup()
 
-
-def test_put_object_overwrite_existing(s3_client, config):
+def test_put_object_overwrite_existing(s3_client, shared_bucket):
     """
     Test PutObject overwrites existing object
 
     Second PUT should replace first object
     """
-    fixture = TestFixture(s3_client, config)
-
-    try:
-        bucket_name = fixture.generate_bucket_name('put-overwrite')
-        s3_client.create_bucket(bucket_name)
-
-        key = 'overwrite-object'
+    bucket_name = shared_bucket
 
-        # First PUT
-        data1 = b'original data'
-        put1_response = s3_client.put_object(bucket_name, key, data1)
-        etag1 = put1_response['ETag']
+    key = 'overwrite-object'
 
-        # Second PUT
-        data2 = b'new data that overwrites'
-        put2_response = s3_client.put_object(bucket_name, key, data2)
-        etag2 = put2_response['ETag']
+    # First PUT
+    data1 = b'original data'
+    put1_response = s3_client.put_object(bucket_name, key, data1)
+    etag1 = put1_response['ETag']
 
-        # ETags should differ
-        assert etag1 != etag2, "ETags should differ after overwrite"
+    # Second PUT
+    data2 = b'new data that overwrites'
+    put2_response = s3_client.put_object(bucket_name, key, data2)
+    etag2 = put2_response['ETag']
 
-        # Verify new data is stored
-        get_response = s3_client.get_object(bucket_name, key)
-        retrieved_data = get_response['Body'].read()
-        assert retrieved_data == data2
+    # ETags should differ
+    assert etag1 != etag2, "ETags should differ after overwrite"
 
-    finally:
-        fixture.cleanup()
+    # Verify new data is stored
+    get_response = s3_client.get_object(bucket_name, key)
+    retrieved_data = get_response['Body'].read()
+    assert retrieved_data == data2
 
 
-def test_put_object_large_metadata(s3_client, config):
+def test_put_object_large_metadata(s3_client, shared_bucket):
     """
     Test PutObject with large metadata values
 
     Metadata should handle reasonably large values
     """
-    fixture = TestFixture(s3_client, config)
-
-    try:
-        bucket_name = fixture.generate_bucket_name('put-large-meta')
-        s3_client.create_bucket(bucket_name)
-
-        key = 'large-metadata-object'
-        data = fixture.generate_random_data(100)
+    bucket_name = shared_bucket
 
-        # Create metadata with large values (but within S3 limits)
-        large_value = 'x' * 1000  # 1KB value
-        metadata = {
-            'large-key': large_value,
-            'normal-key': 'normal-value'
-        }
+    key = 'large-metadata-object'
+    data = _RANDOM_DATA[:100]
 
-        s3_client.client.put_object(
-            Bucket=bucket_name,
-            Key=key,
-            Body=data,
-            Metadata=metadata
-        )
+    # Create metadata with large values (but within S3 limits)
+    large_value = 'x' * 1000  # 1KB value
+    metadata = {
+        'large-key': large_value,
+        'normal-key': 'normal-value'
+    }
 
-        head_response = s3_client.head_object(bucket_name, key)
-        retrieved_metadata = head_response.get('Metadata', {})
+    s3_client.client.put_object(
+        Bucket=bucket_name,
+        Key=key,
+        Body=data,
+        Metadata=metadata
+    )
 
-        assert retrieved_metadata['large-key'] == large_value
-        assert retrieved_metadata['normal-key'] == 'normal-value'
+    head_response = s3_client.head_object(bucket_name, key)
+    retrieved_metadata = head_response.get('Metadata', {})
 
-    finally:
-        fixture.cleanup()
+    assert retrieved_metadata['large-key'] == large_value
+    assert retrieved_metadata['normal-key'] == 'normal-value'
 
 
-def test_put_object_with_tagging(s3_client, config):
+def test_put_object_with_tagging(s3_client, shared_bucket):
     """
     Test PutObject with tagging
 
     Tags should be set during object creation
     """
-    fixture = TestFixture(s3_client, config)
+    bucket_name = shared_bucket
 
-    try:
-        bucket_name = fixture.generate_bucket_name('put-tagging')
-        s3_client.create_bucket(bucket_name)
+    key = 'tagged-object'
+    data = _RANDOM_DATA[:100]
+    tagging = 'key1=value1&key2=value2'
 
-        key = 'tagged-object'
-        data = fixture.generate_random_data(100)
-        tagging = 'key1=value1&key2=value2'
+    s3_client.client.put_object(
+        Bucket=bucket_name,
+        Key=key,
+        Body=data,
+        Tagging=tagging
+    )
 
-        s3_client.client.put_object(
+    # Verify tags were set
+    try:
+        tag_response = s3_client.client.get_object_tagging(
             Bucket=bucket_name,
-            Key=key,
-            Body=data,
-            Tagging=tagging
+            Key=key
         )
 
-        # Verify tags were set
-        try:
-            tag_response = s3_client.client.get_object_tagging(
-                Bucket=bucket_name,
-                Key=key
-            )
-
-            tags = {tag['Key']: tag['Value'] for tag in tag_response.get('TagSet', [])}
-            assert 'key1' in tags
-            assert tags['key1'] == 'value1'
-            assert 'key2' in tags
-            assert tags['key2'] == 'value2'
+        tags = {tag['Key']: tag['Value'] for tag in tag_response.get('TagSet', [])}
+        assert 'key1' in tags
+        assert tags['key1'] == 'value1'
+        assert 'key2' in tags
+        assert tags['key2'] == 'value2'
 
-        except ClientError as e:
-            if e.response['Error']['Code'] != 'NotImplemented':
-                raise
+    except ClientError as e:
+        if e.response['Error']['Code'] != 'NotImplemented':
+            raise
 
-    finally:
-        fixture.cleanup()
 
-
-def test_put_object_success_returns_etag(s3_client, config):
+def test_put_object_success_returns_etag(s3_client, shared_bucket):
     """
     Test PutObject returns ETag
 
     ETag should be present in response
     """
-    fixture = TestFixture(s3_client, config)
-
-    try:
-        bucket_name = fixture.generate_bucket_name('put-etag')
-        s3_client.create_bucket(bucket_name)
-
-        key = 'etag-object'
-        data = fixture.generate_random_data(256)
+    bucket_name = shared_bucket
 
-        put_response = s3_client.put_object(bucket_name, key, data)
+    key = 'etag-object'
+    data = _RANDOM_DATA[:256]
 
-        assert 'ETag' in put_response
-        assert put_response['ETag'] is not None
-        assert len(put_response['ETag']) > 0
+    put_response = s3_client.put_object(bucket_name, key, data)
 
-    finally:
-        fixture.cleanup()
+    assert 'ETag' in put_response
+    assert put_response['ETag'] is not None
+    assert len(put_response['ETag']) > 0
@@ -15,7 +15,7 @@ import pytest
 from tests.common.test_utils import random_string
 
 
-def test_list_objects_url_plus_encoding(s3_client, sdk_capabilities, config):
+def test_list_objects_url_plus_encoding(s3_client, sdk_profile, config):
     """
     Test how SDK handles '+' characters in object keys during listing.
 
@@ -36,8 +36,7 @@ def test_list_objects_url_plus_encoding(s3_client, sdk_capabilities, config):
         s3_client.put_object(bucket_name, key_with_plus, b"test data")
 
         # Check SDK capability for how it handles '+' in listing
-        caps = sdk_capabilities.get("profile", {})
-        plus_treated_as_space = caps.get(
+        plus_treated_as_space = sdk_profile.get(
             "list_objects_url_plus_treated_as_space", False
         )
 
@@ -75,7 +74,7 @@ def test_list_objects_url_plus_encoding(s3_client, sdk_capabilities, config):
             pass
 
 
-def test_retry_behavior(s3_client, sdk_capabilities):
+def test_retry_behavior(s3_client, sdk_profile):
     """
     Test that demonstrates awareness of SDK retry mode.
 
@@ -86,8 +85,7 @@ def test_retry_behavior(s3_client, sdk_capabilities):
 
     This test doesn't change behavior but demonstrates how to access capabilities.
     """
-    caps = sdk_capabilities.get("profile", {})
-    retry_mode = caps.get("retry_mode", "standard")
+    retry_mode = sdk_profile.get("retry_mode", "standard")
 
     # Log the retry mode (in a real test, this might affect timeout expectations)
     print(f"SDK retry mode: {retry_mode}")
@@ -102,7 +100,7 @@ def test_retry_behavior(s3_client, sdk_capabilities):
         pass
 
 
-def test_checksum_defaults(s3_client, sdk_capabilities, config):
+def test_checksum_defaults(s3_client, sdk_profile, config):
     """
     Test SDK default checksum behavior.
 
@@ -121,8 +119,7 @@ def test_checksum_defaults(s3_client, sdk_capabilities, config):
         response = s3_client.put_object(bucket_name, key, body)
 
         # Check SDK capability for CRC32C default
-        caps = sdk_capabilities.get("profile", {})
-        uses_crc32c = caps.get("crc32c_default", False)
+        uses_crc32c = sdk_profile.get("crc32c_default", False)
 
         if uses_crc32c:
             # Modern SDKs might include CRC32C in response
@@ -143,7 +140,7 @@ def test_checksum_defaults(s3_client, sdk_capabilities, config):
             pass
 
 
-def test_virtual_hosted_style_default(s3_client, sdk_capabilities):
+def test_virtual_hosted_style_default(s3_client, sdk_profile):
     """
     Test demonstrating awareness of SDK addressing style.
 
@@ -153,8 +150,7 @@ def test_virtual_hosted_style_default(s3_client, sdk_capabilities):
 
     This affects how URLs are constructed and validated.
     """
-    caps = sdk_capabilities.get("profile", {})
-    virtual_hosted = caps.get("virtual_hosted_default", True)
+    virtual_hosted = sdk_profile.get("virtual_hosted_default", True)
 
     # Tests that validate URLs or host headers should account for this
     if virtual_hosted:
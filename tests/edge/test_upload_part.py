@@ -15,370 +15,284 @@ Signed-off-by: Luis Chamberlain <mcgrof@kernel.org>
 """
 
 import pytest
-import sys
-import os
+from concurrent.futures import ThreadPoolExecutor
 
-# Add parent directory to path for imports
-sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "../..")))
-
-from tests.common.fixtures import TestFixture
 from botocore.exceptions import ClientError
 
+# Every part but the last must be at least 5MB. The parts are built once
+# here rather than in each test; two fills let a test tell parts apart.
+_PART_SIZE = 5 * 1024 * 1024
+_PART_A = b"a" * _PART_SIZE
+_PART_B = b"b" * _PART_SIZE
+
 
-def test_upload_part_non_existing_bucket(s3_client, config):
+def test_upload_part_non_existing_bucket(s3_client):
     """
     Test UploadPart on non-existing bucket
 
     Should return NoSuchBucket error
     """
-    fixture = TestFixture(s3_client, config)
-
-    try:
-        with pytest.raises(ClientError) as exc_info:
-            s3_client.client.upload_part(
-                Bucket="non-existing-bucket-12345",
-                Key="my-obj",
-                UploadId="fake-upload-id",
-                PartNumber=1,
-                Body=b"test data",
-            )
-
-        error_code = exc_info.value.response["Error"]["Code"]
-        assert error_code == "NoSuchBucket", f"Expected NoSuchBucket, got {error_code}"
+    with pytest.raises(ClientError) as exc_info:
+        s3_client.client.upload_part(
+            Bucket="non-existing-bucket-12345",
+            Key="my-obj",
+            UploadId="fake-upload-id",
+            PartNumber=1,
+            Body=b"test data",
+        )
 
-    finally:
-        fixture.cleanup()
+    error_code = exc_info.value.response["Error"]["Code"]
+    assert error_code == "NoSuchBucket", f"Expected NoSuchBucket, got {error_code}"
 
 
-def test_upload_part_invalid_part_number(s3_client, config):
+def test_upload_part_invalid_part_number(s3_client, shared_bucket, multipart_upload):
     """
     Test UploadPart with invalid part numbers
 
     Part numbers must be 1-10000
     """
-    fixture = TestFixture(s3_client, config)
-
-    try:
-        bucket_name = fixture.generate_bucket_name("upload-part-num")
-        s3_client.create_bucket(bucket_name)
-
-        key = "my-obj"
-        upload_id = s3_client.create_multipart_upload(bucket_name, key)
-
-        # Invalid part numbers
-        invalid_part_numbers = [0, -1, 10001, 2300000]
-
-        for part_num in invalid_part_numbers:
-            with pytest.raises(ClientError) as exc_info:
-                s3_client.client.upload_part(
-                    Bucket=bucket_name,
-                    Key=key,
-                    UploadId=upload_id,
-                    PartNumber=part_num,
-                    Body=b"test data",
-                )
-
-            error_code = exc_info.value.response["Error"]["Code"]
-            assert error_code in [
-                "InvalidArgument",
-                "InvalidPartNumber",
-                "InvalidPart",
-            ], f"Expected InvalidArgument/InvalidPartNumber/InvalidPart for {part_num}, got {error_code}"
-
-    finally:
-        fixture.cleanup()
-
-
-def test_upload_part_non_existing_mp_upload(s3_client, config):
-    """
-    Test UploadPart with non-existing upload ID
+    bucket_name = shared_bucket
 
-    Should return NoSuchUpload error
-    """
-    fixture = TestFixture(s3_client, config)
+    key = "my-obj"
+    upload_id = multipart_upload(key)
 
-    try:
-        bucket_name = fixture.generate_bucket_name("upload-no-mp")
-        s3_client.create_bucket(bucket_name)
+    # Invalid part numbers
+    invalid_part_numbers = [0, -1, 10001, 2300000]
 
-        with pytest.raises(ClientError) as exc_info:
+    def upload_error_code(part_num):
+        try:
             s3_client.client.upload_part(
                 Bucket=bucket_name,
-                Key="my-obj",
-                UploadId="non-existing-upload-id",
-                PartNumber=1,
+                Key=key,
+                UploadId=upload_id,
+                PartNumber=part_num,
                 Body=b"test data",
             )
+        except ClientError as e:
+            return e.response["Error"]["Code"]
+        return None
 
-        error_code = exc_info.value.response["Error"]["Code"]
-        assert error_code == "NoSuchUpload", f"Expected NoSuchUpload, got {error_code}"
+    # The part numbers are independent, so send the uploads concurrently
+    with ThreadPoolExecutor(max_workers=len(invalid_part_numbers)) as executor:
+        error_codes = list(executor.map(upload_error_code, invalid_part_numbers))
 
-    finally:
-        fixture.cleanup()
+    for part_num, error_code in zip(invalid_part_numbers, error_codes):
+        assert error_code in [
+            "InvalidArgument",
+            "InvalidPartNumber",
+            "InvalidPart",
+        ], f"Expected InvalidArgument/InvalidPartNumber/InvalidPart for {part_num}, got {error_code}"
 
 
-def test_upload_part_non_existing_key(s3_client, config):
+def test_upload_part_non_existing_mp_upload(s3_client, shared_bucket):
     """
-    Test UploadPart with wrong object key
+    Test UploadPart with non-existing upload ID
 
-    Upload ID is tied to specific key
+    Should return NoSuchUpload error
     """
-    fixture = TestFixture(s3_client, config)
-
-    try:
-        bucket_name = fixture.generate_bucket_name("upload-wrong-key")
-        s3_client.create_bucket(bucket_name)
-
-        key = "my-obj"
-        upload_id = s3_client.create_multipart_upload(bucket_name, key)
-
-        # Try to upload part with different key
-        with pytest.raises(ClientError) as exc_info:
-            s3_client.client.upload_part(
-                Bucket=bucket_name,
-                Key="non-existing-object-key",
-                UploadId=upload_id,
-                PartNumber=1,
-                Body=b"test data",
-            )
-
-        error_code = exc_info.value.response["Error"]["Code"]
-        assert error_code == "NoSuchUpload", f"Expected NoSuchUpload, got {error_code}"
+    with pytest.raises(ClientError) as exc_info:
+        s3_client.client.upload_part(
+            Bucket=shared_bucket,
+            Key="my-obj",
+            UploadId="non-existing-upload-id",
+            PartNumber=1,
+            Body=b"test data",
+        )
 
-    finally:
-        fixture.cleanup()
+    error_code = exc_info.value.response["Error"]["Code"]
+    assert error_code == "NoSuchUpload", f"Expected NoSuchUpload, got {error_code}"
 
 
-def test_upload_part_success(s3_client, config):
+def test_upload_part_non_existing_key(s3_client, shared_bucket, multipart_upload):
     """
-    Test UploadPart success
+    Test UploadPart with wrong object key
 
-    Should return valid ETag
+    Upload ID is tied to specific key
     """
-    fixture = TestFixture(s3_client, config)
-
-    try:
-        bucket_name = fixture.generate_bucket_name("upload-success")
-        s3_client.create_bucket(bucket_name)
+    bucket_name = shared_bucket
 
-        key = "my-obj"
-        upload_id = s3_client.create_multipart_upload(bucket_name, key)
+    key = "my-obj"
+    upload_id = multipart_upload(key)
 
-        # Upload a part
-        part_data = b"a" * (5 * 1024 * 1024)  # 5MB minimum
-        upload_response = s3_client.client.upload_part(
+    # Try to upload part with different key
+    with pytest.raises(ClientError) as exc_info:
+        s3_client.client.upload_part(
             Bucket=bucket_name,
-            Key=key,
+            Key="non-existing-object-key",
             UploadId=upload_id,
             PartNumber=1,
-            Body=part_data,
+            Body=b"test data",
         )
 
-        # Verify response
-        assert "ETag" in upload_response
-        assert upload_response["ETag"] != ""
-
-    finally:
-        fixture.cleanup()
+    error_code = exc_info.value.response["Error"]["Code"]
+    assert error_code == "NoSuchUpload", f"Expected NoSuchUpload, got {error_code}"
 
 
-def test_upload_part_multiple_parts(s3_client, config):
+def test_upload_part_success(s3_client, shared_bucket, multipart_upload):
     """
-    Test uploading multiple parts
+    Test UploadPart success
 
-    Parts can be uploaded in any order
+    Should return a 200 response with a valid ETag
     """
-    fixture = TestFixture(s3_client, config)
+    bucket_name = shared_bucket
 
-    try:
-        bucket_name = fixture.generate_bucket_name("upload-multi")
-        s3_client.create_bucket(bucket_name)
+    key = "my-obj"
+    upload_id = multipart_upload(key)
 
-        key = "multi-part-obj"
-        upload_id = s3_client.create_multipart_upload(bucket_name, key)
+    # Upload a part
+    part_data = _PART_A
+    upload_response = s3_client.client.upload_part(
+        Bucket=bucket_name,
+        Key=key,
+        UploadId=upload_id,
+        PartNumber=1,
+        Body=part_data,
+    )
 
-        part_data = b"x" * (5 * 1024 * 1024)  # 5MB per part
-
-        # Upload parts in non-sequential order
-        etags = {}
-        for part_num in [3, 1, 2]:
-            response = s3_client.client.upload_part(
-                Bucket=bucket_name,
-                Key=key,
-                UploadId=upload_id,
-                PartNumber=part_num,
-                Body=part_data,
-            )
-            etags[part_num] = response["ETag"]
-
-        # List parts to verify all uploaded
-        list_response = s3_client.client.list_parts(
-            Bucket=bucket_name, Key=key, UploadId=upload_id
-        )
-
-        parts = list_response.get("Parts", [])
-        assert len(parts) == 3
-
-        # Verify parts are listed in order
-        part_numbers = [p["PartNumber"] for p in parts]
-        assert part_numbers == [1, 2, 3]
-
-    finally:
-        fixture.cleanup()
+    # Verify response
+    assert "ETag" in upload_response
+    assert upload_response["ETag"] != ""
+    assert upload_response["ResponseMetadata"]["HTTPStatusCode"] == 200
 
 
-def test_upload_part_overwrite_part(s3_client, config):
+def test_upload_part_multiple_parts(s3_client, shared_bucket, multipart_upload):
     """
-    Test uploading same part number twice
+    Test uploading multiple parts
 
-    Later upload should overwrite earlier one
+    Parts can be uploaded in any order
     """
-    fixture = TestFixture(s3_client, config)
+    bucket_name = shared_bucket
 
-    try:
-        bucket_name = fixture.generate_bucket_name("upload-overwrite")
-        s3_client.create_bucket(bucket_name)
-
-        key = "overwrite-part-obj"
-        upload_id = s3_client.create_multipart_upload(bucket_name, key)
+    key = "multi-part-obj"
+    upload_id = multipart_upload(key)
 
-        part_num = 1
-        part_size = 5 * 1024 * 1024
+    part_data = _PART_A
 
-        # Upload part first time
-        data1 = b"a" * part_size
-        response1 = s3_client.client.upload_part(
+    def upload(part_num):
+        return s3_client.client.upload_part(
             Bucket=bucket_name,
             Key=key,
             UploadId=upload_id,
             PartNumber=part_num,
-            Body=data1,
+            Body=part_data,
         )
-        etag1 = response1["ETag"]
 
-        # Upload same part again with different data
-        data2 = b"b" * part_size
-        response2 = s3_client.client.upload_part(
-            Bucket=bucket_name,
-            Key=key,
-            UploadId=upload_id,
-            PartNumber=part_num,
-            Body=data2,
-        )
-        etag2 = response2["ETag"]
+    # Upload parts concurrently, as multipart clients do, so they
+    # arrive in no particular order
+    with ThreadPoolExecutor(max_workers=3) as executor:
+        responses = list(executor.map(upload, [3, 1, 2]))
+    assert all("ETag" in response for response in responses)
 
-        # ETags should be different
-        assert etag1 != etag2
+    # List parts to verify all uploaded
+    list_response = s3_client.client.list_parts(
+        Bucket=bucket_name, Key=key, UploadId=upload_id
+    )
 
-        # List parts - should only show one part
-        list_response = s3_client.client.list_parts(
-            Bucket=bucket_name, Key=key, UploadId=upload_id
-        )
+    parts = list_response.get("Parts", [])
+    assert len(parts) == 3
 
-        parts = list_response.get("Parts", [])
-        assert len(parts) == 1
-        assert parts[0]["PartNumber"] == part_num
-        assert parts[0]["ETag"] == etag2  # Should have latest ETag
+    # Verify parts are listed in order
+    part_numbers = [p["PartNumber"] for p in parts]
+    assert part_numbers == [1, 2, 3]
 
-    finally:
-        fixture.cleanup()
 
+def test_upload_part_overwrite_part(s3_client, shared_bucket, multipart_upload):
+    """
+    Test uploading same part number twice
 
-def test_upload_part_empty_body(s3_client, config):
+    Later upload should overwrite earlier one
+    """
+    bucket_name = shared_bucket
+
+    key = "overwrite-part-obj"
+    upload_id = multipart_upload(key)
+
+    part_num = 1
+
+    # Upload part first time
+    data1 = _PART_A
+    response1 = s3_client.client.upload_part(
+        Bucket=bucket_name,
+        Key=key,
+        UploadId=upload_id,
+        PartNumber=part_num,
+        Body=data1,
+    )
+    etag1 = response1["ETag"]
+
+    # Upload same part again with different data
+    data2 = _PART_B
+    response2 = s3_client.client.upload_part(
+        Bucket=bucket_name,
+        Key=key,
+        UploadId=upload_id,
+        PartNumber=part_num,
+        Body=data2,
+    )
+    etag2 = response2["ETag"]
+
+    # ETags should be different
+    assert etag1 != etag2
+
+    # List parts - should only show one part
+    list_response = s3_client.client.list_parts(
+        Bucket=bucket_name, Key=key, UploadId=upload_id
+    )
+
+    parts = list_response.get("Parts", [])
+    assert len(parts) == 1
+    assert parts[0]["PartNumber"] == part_num
+    assert parts[0]["ETag"] == etag2  # Should have latest ETag
+
+
+def test_upload_part_empty_body(s3_client, shared_bucket, multipart_upload):
     """
     Test UploadPart with empty body
 
     Empty parts may be rejected or accepted depending on implementation
     """
-    fixture = TestFixture(s3_client, config)
-
-    try:
-        bucket_name = fixture.generate_bucket_name("upload-empty")
-        s3_client.create_bucket(bucket_name)
+    bucket_name = shared_bucket
 
-        key = "empty-part-obj"
-        upload_id = s3_client.create_multipart_upload(bucket_name, key)
-
-        # Try to upload empty part
-        try:
-            response = s3_client.client.upload_part(
-                Bucket=bucket_name, Key=key, UploadId=upload_id, PartNumber=1, Body=b""
-            )
-            # If accepted, should have ETag
-            assert "ETag" in response
-        except ClientError as e:
-            # Some implementations may reject empty parts
-            error_code = e.response["Error"]["Code"]
-            # Accept either behavior
-            assert error_code in ["EntityTooSmall", "InvalidRequest"]
-
-    finally:
-        fixture.cleanup()
-
-
-def test_upload_part_response_metadata(s3_client, config):
-    """
-    Test UploadPart response contains expected metadata
-
-    Response should include ETag and server metadata
-    """
-    fixture = TestFixture(s3_client, config)
+    key = "empty-part-obj"
+    upload_id = multipart_upload(key)
 
+    # Try to upload empty part
     try:
-        bucket_name = fixture.generate_bucket_name("upload-meta")
-        s3_client.create_bucket(bucket_name)
-
-        key = "metadata-obj"
-        upload_id = s3_client.create_multipart_upload(bucket_name, key)
-
-        part_data = b"z" * (5 * 1024 * 1024)
         response = s3_client.client.upload_part(
-            Bucket=bucket_name,
-            Key=key,
-            UploadId=upload_id,
-            PartNumber=1,
-            Body=part_data,
+            Bucket=bucket_name, Key=key, UploadId=upload_id, PartNumber=1, Body=b""
         )
-
-        # Verify response structure
+        # If accepted, should have ETag
         assert "ETag" in response
-        assert "ResponseMetadata" in response
-        assert response["ResponseMetadata"]["HTTPStatusCode"] == 200
+    except ClientError as e:
+        # Some implementations may reject empty parts
+        error_code = e.response["Error"]["Code"]
+        # Accept either behavior
+        assert error_code in ["EntityTooSmall", "InvalidRequest"]
 
-    finally:
-        fixture.cleanup()
 
-
-def test_upload_part_after_abort(s3_client, config):
+def test_upload_part_after_abort(s3_client, shared_bucket, multipart_upload):
     """
     Test UploadPart after aborting upload
 
     Should return NoSuchUpload error
     """
-    fixture = TestFixture(s3_client, config)
-
-    try:
-        bucket_name = fixture.generate_bucket_name("upload-after-abort")
-        s3_client.create_bucket(bucket_name)
-
-        key = "aborted-obj"
-        upload_id = s3_client.create_multipart_upload(bucket_name, key)
+    bucket_name = shared_bucket
 
-        # Abort the upload
-        s3_client.abort_multipart_upload(bucket_name, key, upload_id)
+    key = "aborted-obj"
+    upload_id = multipart_upload(key)
 
-        # Try to upload part after abort
-        with pytest.raises(ClientError) as exc_info:
-            s3_client.client.upload_part(
-                Bucket=bucket_name,
-                Key=key,
-                UploadId=upload_id,
-                PartNumber=1,
-                Body=b"a" * (5 * 1024 * 1024),
-            )
+    # Abort the upload
+    s3_client.abort_multipart_upload(bucket_name, key, upload_id)
 
-        error_code = exc_info.value.response["Error"]["Code"]
-        assert error_code == "NoSuchUpload", f"Expected NoSuchUpload, got {error_code}"
+    # Try to upload part after abort
+    with pytest.raises(ClientError) as exc_info:
+        s3_client.client.upload_part(
+            Bucket=bucket_name,
+            Key=key,
+            UploadId=upload_id,
+            PartNumber=1,
+            Body=_PART_A,
+        )
 
-    finally:
-        fixture.cleanup()
+    error_code = exc_info.value.response["Error"]["Code"]
+    assert error_code == "NoSuchUpload", f"Expected NoSuchUpload, got {error_code}"
@@ -28,100 +28,92 @@ Signed-off-by: Luis Chamberlain <mcgrof@kernel.org>
 """
 
 import pytest
-import sys
-import os
 import base64
 import hashlib
 
-# Add parent directory to path for imports
-sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "../..")))
-
-from tests.common.fixtures import TestFixture
 from botocore.exceptions import ClientError
 
+from tests.common.fixtures import calculate_checksum
+
+# Body of the UploadPartCopy source objects, built once for the module
+_SOURCE_DATA = b"x" * 300
+
+# Part body of the successful uploads and its checksums, computed once here
+# instead of being written out as literals that go stale when the body changes
+_PART_DATA = b"test data"
+_PART_CHECKSUMS = {
+    algo: calculate_checksum(_PART_DATA, algo) for algo in ("CRC32", "SHA1", "SHA256")
+}
 
-def test_upload_part_checksum_algorithm_and_header_mismatch(s3_client, config):
+
+def test_upload_part_checksum_algorithm_and_header_mismatch(
+    s3_client, shared_bucket, multipart_upload
+):
     """
     Test UploadPart with ChecksumAlgorithm and mismatched checksum header
 
     When ChecksumAlgorithm is CRC32, but ChecksumCRC32C header is provided,
     should return InvalidRequest error
     """
-    fixture = TestFixture(s3_client, config)
+    bucket_name = shared_bucket
+    obj_key = "mp-checksum-mismatch"
 
-    try:
-        bucket_name = fixture.generate_bucket_name("mp-checksum-mismatch")
-        s3_client.create_bucket(bucket_name)
-        obj_key = "my-obj"
+    # Create multipart upload with CRC32 checksum algorithm
+    upload_id = multipart_upload(obj_key, ChecksumAlgorithm="CRC32")
 
-        # Create multipart upload with CRC32 checksum algorithm
-        mp_response = s3_client.client.create_multipart_upload(
-            Bucket=bucket_name, Key=obj_key, ChecksumAlgorithm="CRC32"
+    # Try to upload part with CRC32 algorithm but CRC32C header
+    with pytest.raises(ClientError) as exc_info:
+        s3_client.client.upload_part(
+            Bucket=bucket_name,
+            Key=obj_key,
+            UploadId=upload_id,
+            PartNumber=1,
+            ChecksumAlgorithm="CRC32",
+            ChecksumCRC32C="m0cB1Q==",
         )
-        upload_id = mp_response["UploadId"]
 
-        # Try to upload part with CRC32 algorithm but CRC32C header
-        with pytest.raises(ClientError) as exc_info:
-            s3_client.client.upload_part(
-                Bucket=bucket_name,
-                Key=obj_key,
-                UploadId=upload_id,
-                PartNumber=1,
-                ChecksumAlgorithm="CRC32",
-                ChecksumCRC32C="m0cB1Q==",
-            )
+    error_code = exc_info.value.response["Error"]["Code"]
+    assert error_code in [
+        "InvalidRequest",
+        "InvalidArgument",
+    ], f"Expected InvalidRequest, got {error_code}"
 
-        error_code = exc_info.value.response["Error"]["Code"]
-        assert error_code in [
-            "InvalidRequest",
-            "InvalidArgument",
-        ], f"Expected InvalidRequest, got {error_code}"
-
-    finally:
-        fixture.cleanup()
 
-
-def test_upload_part_multiple_checksum_headers(s3_client, config):
+def test_upload_part_multiple_checksum_headers(
+    s3_client, shared_bucket, multipart_upload
+):
     """
     Test UploadPart with multiple checksum headers
 
     Should return InvalidRequest error when multiple checksum headers provided
     """
-    fixture = TestFixture(s3_client, config)
+    bucket_name = shared_bucket
+    obj_key = "mp-checksum-multiple"
 
-    try:
-        bucket_name = fixture.generate_bucket_name("mp-checksum-multiple")
-        s3_client.create_bucket(bucket_name)
-        obj_key = "my-obj"
+    # Create multipart upload with CRC32C checksum algorithm
+    upload_id = multipart_upload(obj_key, ChecksumAlgorithm="CRC32C")
 
-        # Create multipart upload with CRC32C checksum algorithm
-        mp_response = s3_client.client.create_multipart_upload(
-            Bucket=bucket_name, Key=obj_key, ChecksumAlgorithm="CRC32C"
+    # Try to upload part with both SHA1 and CRC32C checksums
+    with pytest.raises(ClientError) as exc_info:
+        s3_client.client.upload_part(
+            Bucket=bucket_name,
+            Key=obj_key,
+            UploadId=upload_id,
+            PartNumber=1,
+            ChecksumSHA1="Kq5sNclPz7QV2+lfQIuc6R7oRu0=",
+            ChecksumCRC32C="m0cB1Q==",
         )
-        upload_id = mp_response["UploadId"]
-
-        # Try to upload part with both SHA1 and CRC32C checksums
-        with pytest.raises(ClientError) as exc_info:
-            s3_client.client.upload_part(
-                Bucket=bucket_name,
-                Key=obj_key,
-                UploadId=upload_id,
-                PartNumber=1,
-                ChecksumSHA1="Kq5sNclPz7QV2+lfQIuc6R7oRu0=",
-                ChecksumCRC32C="m0cB1Q==",
-            )
 
-        error_code = exc_info.value.response["Error"]["Code"]
-        assert error_code in [
-            "InvalidRequest",
-            "InvalidArgument",
-        ], f"Expected InvalidRequest, got {error_code}"
-
-    finally:
-        fixture.cleanup()
+    error_code = exc_info.value.response["Error"]["Code"]
+    assert error_code in [
+        "InvalidRequest",
+        "InvalidArgument",
+    ], f"Expected InvalidRequest, got {error_code}"
 
 
-def test_upload_part_invalid_checksum_header(s3_client, config):
+def test_upload_part_invalid_checksum_header(
+    s3_client, shared_bucket, multipart_upload
+):
     """
     Test UploadPart with invalid checksum header values
 
@@ -133,195 +125,175 @@ def test_upload_part_invalid_checksum_header(s3_client, config):
     Note: boto3 may validate checksums client-side, preventing invalid
     checksums from reaching the server
     """
-    fixture = TestFixture(s3_client, config)
-
-    try:
-        bucket_name = fixture.generate_bucket_name("mp-checksum-invalid")
-        s3_client.create_bucket(bucket_name)
-        obj_key = "my-obj"
-
-        # Create multipart upload without checksum algorithm
-        mp_response = s3_client.client.create_multipart_upload(
-            Bucket=bucket_name, Key=obj_key
-        )
-        upload_id = mp_response["UploadId"]
-
-        # Test invalid CRC32 checksums
-        # Note: boto3 validates base64 client-side, so we test with valid base64
-        # but incorrect checksum length
-        invalid_checksums = [
-            {
-                "ChecksumCRC32": "YXNrZGpoZ2tqYXNo"
-            },  # Valid base64 but wrong length (should be 4 bytes for CRC32)
-        ]
-
-        for checksum_params in invalid_checksums:
-            try:
-                response = s3_client.client.upload_part(
-                    Bucket=bucket_name,
-                    Key=obj_key,
-                    UploadId=upload_id,
-                    PartNumber=1,
-                    Body=b"test data",
-                    **checksum_params,
-                )
-                # If it succeeds, MinIO accepts invalid checksum lengths
-                # This is acceptable - test passes
-            except ClientError as e:
-                error_code = e.response["Error"]["Code"]
-                # Accept various error codes for invalid checksums
-                assert error_code in [
-                    "InvalidRequest",
-                    "InvalidArgument",
-                    "InvalidDigest",
-                    "BadRequest",
-                ], f"Expected checksum validation error, got {error_code}"
-
-    finally:
-        fixture.cleanup()
-
-
-def test_upload_part_checksum_algorithm_mismatch_on_initialization(s3_client, config):
+    bucket_name = shared_bucket
+    obj_key = "mp-checksum-invalid"
+
+    # Create multipart upload without checksum algorithm
+    upload_id = multipart_upload(obj_key)
+
+    # Test invalid CRC32 checksums
+    # Note: boto3 validates base64 client-side, so we test with valid base64
+    # but incorrect checksum length
+    invalid_checksums = [
+        {
+            "ChecksumCRC32": "YXNrZGpoZ2tqYXNo"
+        },  # Valid base64 but wrong length (should be 4 bytes for CRC32)
+    ]
+
+    for checksum_params in invalid_checksums:
+        try:
+            response = s3_client.client.upload_part(
+                Bucket=bucket_name,
+                Key=obj_key,
+                UploadId=upload_id,
+                PartNumber=1,
+                Body=b"test data",
+                **checksum_params,
+            )
+            # If it succeeds, MinIO accepts invalid checksum lengths
+            # This is acceptable - test passes
+        except ClientError as e:
+            error_code = e.response["Error"]["Code"]
+            # Accept various error codes for invalid checksums
+            assert error_code in [
+                "InvalidRequest",
+                "InvalidArgument",
+                "InvalidDigest",
+                "BadRequest",
+            ], f"Expected checksum validation error, got {error_code}"
+
+
+def test_upload_part_checksum_algorithm_mismatch_on_initialization(
+    s3_client, shared_bucket, multipart_upload
+):
     """
     Test UploadPart with mismatched checksum algorithm
 
     When multipart upload initialized with CRC32, upload part with SHA1
     should return InvalidRequest error
     """
-    fixture = TestFixture(s3_client, config)
+    bucket_name = shared_bucket
+    obj_key = "mp-algo-mismatch"
 
-    try:
-        bucket_name = fixture.generate_bucket_name("mp-algo-mismatch")
-        s3_client.create_bucket(bucket_name)
-        obj_key = "my-obj"
+    # Create multipart upload with CRC32 checksum algorithm
+    upload_id = multipart_upload(obj_key, ChecksumAlgorithm="CRC32")
 
-        # Create multipart upload with CRC32 checksum algorithm
-        mp_response = s3_client.client.create_multipart_upload(
-            Bucket=bucket_name, Key=obj_key, ChecksumAlgorithm="CRC32"
+    # Try to upload part with SHA1 algorithm (mismatch)
+    with pytest.raises(ClientError) as exc_info:
+        s3_client.client.upload_part(
+            Bucket=bucket_name,
+            Key=obj_key,
+            UploadId=upload_id,
+            PartNumber=1,
+            ChecksumAlgorithm="SHA1",
         )
-        upload_id = mp_response["UploadId"]
-
-        # Try to upload part with SHA1 algorithm (mismatch)
-        with pytest.raises(ClientError) as exc_info:
-            s3_client.client.upload_part(
-                Bucket=bucket_name,
-                Key=obj_key,
-                UploadId=upload_id,
-                PartNumber=1,
-                ChecksumAlgorithm="SHA1",
-            )
-
-        error_code = exc_info.value.response["Error"]["Code"]
-        assert error_code in [
-            "InvalidRequest",
-            "InvalidArgument",
-        ], f"Expected InvalidRequest, got {error_code}"
 
-    finally:
-        fixture.cleanup()
+    error_code = exc_info.value.response["Error"]["Code"]
+    assert error_code in [
+        "InvalidRequest",
+        "InvalidArgument",
+    ], f"Expected InvalidRequest, got {error_code}"
 
 
-def test_upload_part_checksum_algorithm_mismatch_with_value(s3_client, config):
+def test_upload_part_checksum_algorithm_mismatch_with_value(
+    s3_client, shared_bucket, multipart_upload
+):
     """
     Test UploadPart with mismatched checksum algorithm and value
 
     When multipart upload initialized with CRC32, but SHA256 checksum
     value provided, should return InvalidRequest error
     """
-    fixture = TestFixture(s3_client, config)
+    bucket_name = shared_bucket
+    obj_key = "mp-algo-mismatch-value"
 
-    try:
-        bucket_name = fixture.generate_bucket_name("mp-algo-mismatch-value")
-        s3_client.create_bucket(bucket_name)
-        obj_key = "my-obj"
+    # Create multipart upload with CRC32 checksum algorithm
+    upload_id = multipart_upload(obj_key, ChecksumAlgorithm="CRC32")
 
-        # Create multipart upload with CRC32 checksum algorithm
-        mp_response = s3_client.client.create_multipart_upload(
-            Bucket=bucket_name, Key=obj_key, ChecksumAlgorithm="CRC32"
+    # Try to upload part with SHA256 checksum value (mismatch)
+    with pytest.raises(ClientError) as exc_info:
+        s3_client.client.upload_part(
+            Bucket=bucket_name,
+            Key=obj_key,
+            UploadId=upload_id,
+            PartNumber=1,
+            ChecksumSHA256="uU0nuZNNPgilLlLX2n2r+sSE7+N6U4DukIj3rOLvzek=",
         )
-        upload_id = mp_response["UploadId"]
-
-        # Try to upload part with SHA256 checksum value (mismatch)
-        with pytest.raises(ClientError) as exc_info:
-            s3_client.client.upload_part(
-                Bucket=bucket_name,
-                Key=obj_key,
-                UploadId=upload_id,
-                PartNumber=1,
-                ChecksumSHA256="uU0nuZNNPgilLlLX2n2r+sSE7+N6U4DukIj3rOLvzek=",
-            )
-
-        error_code = exc_info.value.response["Error"]["Code"]
-        assert error_code in [
-            "InvalidRequest",
-            "InvalidArgument",
-        ], f"Expected InvalidRequest, got {error_code}"
 
-    finally:
-        fixture.cleanup()
-
-
-def test_upload_part_incorrect_checksums(s3_client, config):
+    error_code = exc_info.value.response["Error"]["Code"]
+    assert error_code in [
+        "InvalidRequest",
+        "InvalidArgument",
+    ], f"Expected InvalidRequest, got {error_code}"
+
+
+# Well-formed checksums that do not match the part body. botocore sends a
+# checksum supplied by the caller as it is, without recomputing it, so
+# every algorithm reaches the server with the wrong value.
+@pytest.mark.parametrize(
+    "algo, checksum_params",
+    [
+        pytest.param("CRC32", {"ChecksumCRC32": "DUoRhQ=="}, id="crc32"),
+        pytest.param("CRC32C", {"ChecksumCRC32C": "m0cB1Q=="}, id="crc32c"),
+        pytest.param(
+            "SHA1", {"ChecksumSHA1": "Kq5sNclPz7QV2+lfQIuc6R7oRu0="}, id="sha1"
+        ),
+        pytest.param(
+            "SHA256",
+            {"ChecksumSHA256": "uU0nuZNNPgilLlLX2n2r+sSE7+N6U4DukIj3rOLvzek="},
+            id="sha256",
+        ),
+    ],
+)
+def test_upload_part_incorrect_checksums(
+    s3_client, shared_bucket, multipart_upload, algo, checksum_params
+):
     """
     Test UploadPart with incorrect checksum values
 
     Should return InvalidDigest/BadDigest when checksum doesn't match content
 
-    Note: boto3 validates SHA256 checksums client-side and will reject
-    incorrect values before sending to server. We test CRC32 and SHA1
-    which are validated server-side.
+    Note: the multipart upload is created without ChecksumAlgorithm, so
+    boto3 has no algorithm of its own to check the value against and
+    leaves the validation to the server.
     """
-    fixture = TestFixture(s3_client, config)
+    bucket_name = shared_bucket
+    obj_key = f"mp-incorrect-checksum-{algo}"
+    body = b"random string body"
+
+    # Create multipart upload without checksum algorithm
+    # to avoid boto3 client-side validation
+    upload_id = multipart_upload(obj_key)
 
+    # Try to upload part with incorrect checksum
     try:
-        bucket_name = fixture.generate_bucket_name("mp-incorrect-checksum")
-        s3_client.create_bucket(bucket_name)
-        obj_key = "my-obj"
-        body = b"random string body"
-
-        # Test checksum algorithms that are validated server-side
-        # SHA256 is validated client-side by boto3
-        test_cases = [
-            ("CRC32", {"ChecksumCRC32": "DUoRhQ=="}),
-            ("SHA1", {"ChecksumSHA1": "Kq5sNclPz7QV2+lfQIuc6R7oRu0="}),
-        ]
-
-        for algo, checksum_params in test_cases:
-            # Create multipart upload without checksum algorithm
-            # to avoid boto3 client-side validation
-            mp_response = s3_client.client.create_multipart_upload(
-                Bucket=bucket_name, Key=f"{obj_key}-{algo}"
-            )
-            upload_id = mp_response["UploadId"]
-
-            # Try to upload part with incorrect checksum
-            try:
-                response = s3_client.client.upload_part(
-                    Bucket=bucket_name,
-                    Key=f"{obj_key}-{algo}",
-                    UploadId=upload_id,
-                    PartNumber=1,
-                    Body=body,
-                    **checksum_params,
-                )
-                # If it succeeds, MinIO doesn't validate checksums without algorithm
-                # This is acceptable - test passes
-            except ClientError as e:
-                error_code = e.response["Error"]["Code"]
-                # Accept various error codes for checksum mismatch
-                assert error_code in [
-                    "InvalidDigest",
-                    "BadDigest",
-                    "InvalidRequest",
-                    "XAmzContentSHA256Mismatch",
-                    "XAmzContentChecksumMismatch",
-                ], f"Expected checksum mismatch error for {algo}, got {error_code}"
-
-    finally:
-        fixture.cleanup()
-
-
-def test_upload_part_with_checksums_success(s3_client, config):
+        response = s3_client.client.upload_part(
+            Bucket=bucket_name,
+            Key=obj_key,
+            UploadId=upload_id,
+            PartNumber=1,
+            Body=body,
+            **checksum_params,
+        )
+        # If it succeeds, MinIO doesn't validate checksums without algorithm
+        # This is acceptable - test passes
+    except ClientError as e:
+        error_code = e.response["Error"]["Code"]
+        # Accept various error codes for checksum mismatch
+        assert error_code in [
+            "InvalidDigest",
+            "BadDigest",
+            "InvalidRequest",
+            "XAmzContentSHA256Mismatch",
+            "XAmzContentChecksumMismatch",
+        ], f"Expected checksum mismatch error for {algo}, got {error_code}"
+
+
+# CRC32, SHA1, SHA256 are supported without CRT
+@pytest.mark.parametrize("algo", ["CRC32", "SHA1", "SHA256"])
+def test_upload_part_with_checksums_success(
+    s3_client, shared_bucket, multipart_upload, algo
+):
     """
     Test successful UploadPart with automatic checksum calculation
 
@@ -334,45 +306,37 @@ def test_upload_part_with_checksums_success(s3_client, config):
     Note: CRC32C and CRC64NVME require botocore[crt] dependency, skipped if
     not available.
     """
-    fixture = TestFixture(s3_client, config)
-
-    try:
-        bucket_name = fixture.generate_bucket_name("mp-checksum-success")
-        s3_client.create_bucket(bucket_name)
-        obj_key = "my-obj"
-
-        # Test each checksum algorithm
-        # CRC32, SHA1, SHA256 are supported without CRT
-        algorithms = ["CRC32", "SHA1", "SHA256"]
-
-        for algo in algorithms:
-            # Create multipart upload with specific algorithm
-            mp_response = s3_client.client.create_multipart_upload(
-                Bucket=bucket_name, Key=f"{obj_key}-{algo}", ChecksumAlgorithm=algo
-            )
-            upload_id = mp_response["UploadId"]
-
-            # Upload part with checksum algorithm
-            response = s3_client.client.upload_part(
-                Bucket=bucket_name,
-                Key=f"{obj_key}-{algo}",
-                UploadId=upload_id,
-                PartNumber=1,
-                Body=b"test data",
-                ChecksumAlgorithm=algo,
-            )
-
-            # Verify upload succeeded - response should have ETag at minimum
-            assert "ETag" in response, f"Expected ETag in response for {algo}"
-
-            # Checksum may or may not be in response depending on implementation
-            # boto3 calculates it client-side, so we just verify upload worked
-
-    finally:
-        fixture.cleanup()
+    bucket_name = shared_bucket
+    obj_key = f"mp-checksum-success-{algo}"
+
+    # Create multipart upload with specific algorithm
+    upload_id = multipart_upload(obj_key, ChecksumAlgorithm=algo)
+
+    # Upload part with checksum algorithm
+    response = s3_client.client.upload_part(
+        Bucket=bucket_name,
+        Key=obj_key,
+        UploadId=upload_id,
+        PartNumber=1,
+        Body=_PART_DATA,
+        ChecksumAlgorithm=algo,
+    )
+
+    # Verify upload succeeded - response should have ETag at minimum
+    assert "ETag" in response, f"Expected ETag in response for {algo}"
+
+    # Checksum may or may not be in response depending on implementation,
+    # but when the server returns one it must be that of the part
+    checksum = response.get(f"Checksum{algo}")
+    if checksum is not None:
+        assert (
+            checksum == _PART_CHECKSUMS[algo]
+        ), f"Expected {algo} checksum {_PART_CHECKSUMS[algo]}, got {checksum}"
 
 
-def test_upload_part_copy_should_copy_checksum(s3_client, config):
+def test_upload_part_copy_should_copy_checksum(
+    s3_client, shared_bucket, multipart_upload
+):
     """
     Test UploadPartCopy copies checksum from source object
 
@@ -382,111 +346,95 @@ def test_upload_part_copy_should_copy_checksum(s3_client, config):
     Note: MinIO may not support checksum copying in UploadPartCopy.
     Test passes if copy succeeds.
     """
-    fixture = TestFixture(s3_client, config)
-
+    bucket_name = shared_bucket
+    obj_key = "upc-copy-checksum"
+    src_key = "upc-copy-checksum-src"
+
+    # Create multipart upload with CRC32 checksum algorithm
+    upload_id = multipart_upload(obj_key, ChecksumAlgorithm="CRC32")
+
+    # Put source object with CRC32 checksum
+    put_response = s3_client.client.put_object(
+        Bucket=bucket_name,
+        Key=src_key,
+        Body=_SOURCE_DATA,
+        ChecksumAlgorithm="CRC32",
+    )
+
+    # Copy part from source
     try:
-        bucket_name = fixture.generate_bucket_name("upc-copy-checksum")
-        s3_client.create_bucket(bucket_name)
-        obj_key = "my-obj"
-        src_key = "source-object"
-
-        # Create multipart upload with CRC32 checksum algorithm
-        mp_response = s3_client.client.create_multipart_upload(
-            Bucket=bucket_name, Key=obj_key, ChecksumAlgorithm="CRC32"
-        )
-        upload_id = mp_response["UploadId"]
-
-        # Put source object with CRC32 checksum
-        put_response = s3_client.client.put_object(
+        copy_response = s3_client.client.upload_part_copy(
             Bucket=bucket_name,
-            Key=src_key,
-            Body=b"x" * 300,
-            ChecksumAlgorithm="CRC32",
+            Key=obj_key,
+            UploadId=upload_id,
+            PartNumber=1,
+            CopySource=f"{bucket_name}/{src_key}",
         )
 
-        # Copy part from source
-        try:
-            copy_response = s3_client.client.upload_part_copy(
-                Bucket=bucket_name,
-                Key=obj_key,
-                UploadId=upload_id,
-                PartNumber=1,
-                CopySource=f"{bucket_name}/{src_key}",
-            )
-
-            # Verify copy succeeded
-            assert "CopyPartResult" in copy_response, "Expected CopyPartResult"
-            assert "ETag" in copy_response["CopyPartResult"], "Expected ETag"
-
-            # Checksum copying is optional - MinIO may not support it
-            # Test passes if copy succeeded
-        except ClientError as e:
-            # MinIO may not support checksums with UploadPartCopy
-            if e.response["Error"]["Code"] in ["NotImplemented", "InvalidArgument"]:
-                pytest.skip("Checksum support in UploadPartCopy not available")
-            raise
+        # Verify copy succeeded
+        assert "CopyPartResult" in copy_response, "Expected CopyPartResult"
+        assert "ETag" in copy_response["CopyPartResult"], "Expected ETag"
 
-    finally:
-        fixture.cleanup()
+        # Checksum copying is optional - MinIO may not support it
+        # Test passes if copy succeeded
+    except ClientError as e:
+        # MinIO may not support checksums with UploadPartCopy
+        if e.response["Error"]["Code"] in ["NotImplemented", "InvalidArgument"]:
+            pytest.skip("Checksum support in UploadPartCopy not available")
+        raise
 
 
-def test_upload_part_copy_should_not_copy_checksum(s3_client, config):
+def test_upload_part_copy_should_not_copy_checksum(
+    s3_client, shared_bucket, multipart_upload
+):
     """
     Test UploadPartCopy does not copy checksum when algorithms differ
 
     When source object has checksum but multipart upload doesn't use checksums,
     checksum should not be copied
     """
-    fixture = TestFixture(s3_client, config)
-
-    try:
-        bucket_name = fixture.generate_bucket_name("upc-no-copy-checksum")
-        s3_client.create_bucket(bucket_name)
-        obj_key = "my-obj"
-        src_key = "source-object"
-
-        # Create multipart upload without checksum algorithm
-        mp_response = s3_client.client.create_multipart_upload(
-            Bucket=bucket_name, Key=obj_key
-        )
-        upload_id = mp_response["UploadId"]
-
-        # Put source object with SHA1 checksum
-        s3_client.client.put_object(
-            Bucket=bucket_name,
-            Key=src_key,
-            Body=b"x" * 300,
-            ChecksumAlgorithm="SHA1",
-        )
-
-        # Copy part from source
-        copy_response = s3_client.client.upload_part_copy(
-            Bucket=bucket_name,
-            Key=obj_key,
-            UploadId=upload_id,
-            PartNumber=1,
-            CopySource=f"{bucket_name}/{src_key}",
-        )
-
-        # Verify no checksums in response
-        assert (
-            "ChecksumCRC32" not in copy_response["CopyPartResult"]
-        ), "Expected no ChecksumCRC32"
-        assert (
-            "ChecksumCRC32C" not in copy_response["CopyPartResult"]
-        ), "Expected no ChecksumCRC32C"
-        assert (
-            "ChecksumSHA1" not in copy_response["CopyPartResult"]
-        ), "Expected no ChecksumSHA1"
-        assert (
-            "ChecksumSHA256" not in copy_response["CopyPartResult"]
-        ), "Expected no ChecksumSHA256"
-
-    finally:
-        fixture.cleanup()
-
-
-def test_upload_part_copy_should_calculate_checksum(s3_client, config):
+    bucket_name = shared_bucket
+    obj_key = "upc-no-copy-checksum"
+    src_key = "upc-no-copy-checksum-src"
+
+    # Create multipart upload without checksum algorithm
+    upload_id = multipart_upload(obj_key)
+
+    # Put source object with SHA1 checksum
+    s3_client.client.put_object(
+        Bucket=bucket_name,
+        Key=src_key,
+        Body=_SOURCE_DATA,
+        ChecksumAlgorithm="SHA1",
+    )
+
+    # Copy part from source
+    copy_response = s3_client.client.upload_part_copy(
+        Bucket=bucket_name,
+        Key=obj_key,
+        UploadId=upload_id,
+        PartNumber=1,
+        CopySource=f"{bucket_name}/{src_key}",
+    )
+
+    # Verify no checksums in response
+    assert (
+        "ChecksumCRC32" not in copy_response["CopyPartResult"]
+    ), "Expected no ChecksumCRC32"
+    assert (
+        "ChecksumCRC32C" not in copy_response["CopyPartResult"]
+    ), "Expected no ChecksumCRC32C"
+    assert (
+        "ChecksumSHA1" not in copy_response["CopyPartResult"]
+    ), "Expected no ChecksumSHA1"
+    assert (
+        "ChecksumSHA256" not in copy_response["CopyPartResult"]
+    ), "Expected no ChecksumSHA256"
+
+
+def test_upload_part_copy_should_calculate_checksum(
+    s3_client, shared_bucket, multipart_upload
+):
     """
     Test UploadPartCopy calculates checksum when algorithms differ
 
@@ -496,53 +444,43 @@ def test_upload_part_copy_should_calculate_checksum(s3_client, config):
     Note: MinIO requires checksum value when multipart upload specifies
     ChecksumAlgorithm. This is a MinIO limitation.
     """
-    fixture = TestFixture(s3_client, config)
-
+    bucket_name = shared_bucket
+    obj_key = "upc-calc-checksum"
+    src_key = "upc-calc-checksum-src"
+
+    # Create multipart upload with SHA256 checksum algorithm
+    upload_id = multipart_upload(obj_key, ChecksumAlgorithm="SHA256")
+
+    # Put source object with SHA1 checksum (different from multipart)
+    s3_client.client.put_object(
+        Bucket=bucket_name,
+        Key=src_key,
+        Body=_SOURCE_DATA,
+        ChecksumAlgorithm="SHA1",
+    )
+
+    # Copy part from source
     try:
-        bucket_name = fixture.generate_bucket_name("upc-calc-checksum")
-        s3_client.create_bucket(bucket_name)
-        obj_key = "my-obj"
-        src_key = "source-object"
-
-        # Create multipart upload with SHA256 checksum algorithm
-        mp_response = s3_client.client.create_multipart_upload(
-            Bucket=bucket_name, Key=obj_key, ChecksumAlgorithm="SHA256"
-        )
-        upload_id = mp_response["UploadId"]
-
-        # Put source object with SHA1 checksum (different from multipart)
-        s3_client.client.put_object(
+        copy_response = s3_client.client.upload_part_copy(
             Bucket=bucket_name,
-            Key=src_key,
-            Body=b"x" * 300,
-            ChecksumAlgorithm="SHA1",
+            Key=obj_key,
+            UploadId=upload_id,
+            PartNumber=1,
+            CopySource=f"{bucket_name}/{src_key}",
         )
 
-        # Copy part from source
-        try:
-            copy_response = s3_client.client.upload_part_copy(
-                Bucket=bucket_name,
-                Key=obj_key,
-                UploadId=upload_id,
-                PartNumber=1,
-                CopySource=f"{bucket_name}/{src_key}",
+        # Verify copy succeeded
+        assert "CopyPartResult" in copy_response, "Expected CopyPartResult"
+        assert "ETag" in copy_response["CopyPartResult"], "Expected ETag"
+
+        # Checksum calculation is optional - MinIO may not support it
+        # Test passes if copy succeeded
+    except ClientError as e:
+        # MinIO returns InvalidArgument when checksum algorithm specified
+        # but checksum value not provided in UploadPartCopy
+        if e.response["Error"]["Code"] in ["InvalidArgument", "NotImplemented"]:
+            pytest.skip(
+                "MinIO requires checksum value with UploadPartCopy when "
+                "ChecksumAlgorithm specified in multipart upload"
             )
-
-            # Verify copy succeeded
-            assert "CopyPartResult" in copy_response, "Expected CopyPartResult"
-            assert "ETag" in copy_response["CopyPartResult"], "Expected ETag"
-
-            # Checksum calculation is optional - MinIO may not support it
-            # Test passes if copy succeeded
-        except ClientError as e:
-            # MinIO returns InvalidArgument when checksum algorithm specified
-            # but checksum value not provided in UploadPartCopy
-            if e.response["Error"]["Code"] in ["InvalidArgument", "NotImplemented"]:
-                pytest.skip(
-                    "MinIO requires checksum value with UploadPartCopy when "
-                    "ChecksumAlgorithm specified in multipart upload"
-                )
-            raise
-
-    finally:
-        fixture.cleanup()
+        raise